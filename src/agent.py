@@ -2,6 +2,7 @@
 
 import logging
 import time
+from collections.abc import Sequence
 from typing import Any
 
 from langchain_core.language_models import BaseChatModel
@@ -19,7 +20,7 @@ class ToolCallingAgent:
     def __init__(
         self,
         llm: BaseChatModel,
-        tools: list[BaseTool],
+        tools: Sequence[BaseTool],
         max_iterations: int = 10,
         tool_service: ToolService | None = None,
     ):
@@ -27,7 +28,7 @@ class ToolCallingAgent:
 
         Args:
             llm: The language model to use
-            tools: List of tools available to the agent
+            tools: Tools available to the agent
             max_iterations: Maximum number of agent loop iterations
             tool_service: Optional service for tracking tool usage
         """
@@ -161,7 +162,8 @@ class ToolCallingAgent:
             else:
                 # Execute tool
                 tool = self.tools[tool_name]
-                result = tool.invoke(tool_args)
+                # Async tools run on this loop; sync ones are run in a worker thread
+                result = await tool.ainvoke(tool_args)
 
                 # Check if result indicates failure
                 if isinstance(result, str) and result.startswith("Error"):
@@ -10,7 +10,13 @@ from .command_router import CommandRouter, CommandType
 from .config import Config
 from .llm_handler import LLMHandler
 from .orm import SelfImprovementRequest
-from .services import ConversationService, DMService, MentionService, RateLimitService
+from .services import (
+    ConversationService,
+    DMService,
+    MentionService,
+    RateLimitService,
+    get_db_service,
+)
 from .services.code_analysis_service import CodeAnalysisService
 from .services.git_service import GitService
 from .services.github_service import GitHubService
@@ -30,7 +36,9 @@ class Bot:
         # Use database-backed services
         self.mention_service = MentionService()
         self.dm_service = DMService()
-        self.rate_limit_service = RateLimitService(config.bot.rate_limit_per_hour)
+        self.rate_limit_service = RateLimitService(
+            config.bot.rate_limit_per_hour, get_db_service()
+        )
         self.conversation_service = ConversationService()
 
         # Command router for slash commands
@@ -55,9 +63,6 @@ class Bot:
         try:
             logger.info("Initializing self-improvement service...")
 
-            # Initialize Git service
-            git_service = GitService(repo_path=repo_path)
-
             # Initialize GitHub service
             github_service = GitHubService(
                 app_id=self.config.github.app_id,
@@ -65,6 +70,11 @@ class Bot:
                 installation_id=self.config.github.installation_id,
             )
 
+            # Initialize Git service, authenticated with the App's installation token
+            git_service = GitService(
+                repo_path=repo_path, token=github_service.get_installation_token
+            )
+
             # Initialize Code Analysis service
             code_analysis_service = CodeAnalysisService(
                 llm=self.llm.llm,  # Access underlying LLM
@@ -96,7 +106,7 @@ class Bot:
         Returns:
             True if command was handled successfully.
         """
-        # Mark as processed IMMEDIATELY to prevent duplicate processing
+        # Claim IMMEDIATELY to prevent duplicate processing
         # For DMs, use dm_service; for mentions, use mention_service
         if mention.uri.startswith("dm://"):
             # Extract convo_id and message_id from dm://convo_id/message_id
@@ -104,7 +114,7 @@ class Bot:
             convo_id = parts[0] if len(parts) > 0 else ""
             message_id = parts[1] if len(parts) > 1 else mention.cid
 
-            await self.dm_service.mark_processed(
+            claimed = await self.dm_service.claim(
                 convo_id=convo_id,
                 message_id=message_id,
                 sender_did=mention.author_did,
@@ -116,7 +126,7 @@ class Bot:
             # Extract thread URI (needed for normal mentions, not DMs)
             thread_uri = mention.root_uri or mention.uri
 
-            await self.mention_service.mark_processed(
+            claimed = await self.mention_service.claim(
                 mention_uri=mention.uri,
                 author_did=mention.author_did,
                 author_handle=mention.author_handle,
@@ -125,6 +135,10 @@ class Bot:
                 thread_uri=thread_uri,
             )
 
+        if not claimed:
+            logger.debug("Skipping command already claimed: %s", mention.uri)
+            return False
+
         if command.command_type == CommandType.SELFIMPROVEMENT:
             # Initialize service if not already done
             if self.selfimprovement_service is None:
@@ -173,11 +187,6 @@ class Bot:
 
             await self._reply_to_mention(mention, message)
 
-            # Record rate limit event
-            await self.rate_limit_service.record_request(
-                user_did=mention.author_did, mention_uri=mention.uri
-            )
-
             return True
 
         # Unknown command (shouldn't happen due to enum, but be safe)
@@ -239,7 +248,6 @@ class Bot:
             success: Whether the request succeeded.
             metadata: Metadata dict with branch_name, pr_number, pr_url, error, execution_time_ms.
         """
-        from .services import get_db_service
 
         try:
             db = get_db_service()
@@ -276,8 +284,10 @@ class Bot:
             logger.debug("Skipping already processed mention: %s", mention.uri)
             return False
 
-        # Rate limiting (database check)
-        if not await self.rate_limit_service.is_allowed(mention.author_did):
+        # Rate limiting (check and reserve in one step; settled below)
+        if not await self.rate_limit_service.try_consume(
+            mention.author_did, mention_uri=mention.uri
+        ):
             remaining = await self.rate_limit_service.get_remaining(mention.author_did)
             logger.warning(
                 "Rate limit exceeded for user %s (%s remaining)",
@@ -286,6 +296,23 @@ class Bot:
             )
             return False
 
+        succeeded = False
+        try:
+            succeeded = await self._respond_to_mention(mention)
+            return succeeded
+        finally:
+            # Only a delivered reply counts against the user's limit
+            self.rate_limit_service.settle(mention.uri, succeeded)
+
+    async def _respond_to_mention(self, mention: Mention) -> bool:
+        """Handle a mention that passed the processed and rate limit checks.
+
+        Args:
+            mention: The mention to process.
+
+        Returns:
+            True if a reply was posted and recorded.
+        """
         logger.info(
             "Processing mention from @%s: %s",
             mention.author_handle,
@@ -369,11 +396,6 @@ class Bot:
                 assistant_post_uri=reply_uri,
             )
 
-            # Record rate limit event
-            await self.rate_limit_service.record_request(
-                user_did=mention.author_did, mention_uri=mention.uri
-            )
-
             logger.info("Successfully replied to @%s", mention.author_handle)
             return True
 
@@ -395,8 +417,9 @@ class Bot:
         if await self.dm_service.is_processed(dm.message_id):
             return False
 
-        # Rate limiting (shared with mentions - database check)
-        if not await self.rate_limit_service.is_allowed(dm.sender_did):
+        # Rate limiting (shared with mentions - check and reserve in one step)
+        dm_uri = f"dm://{dm.convo_id}/{dm.message_id}"
+        if not await self.rate_limit_service.try_consume(dm.sender_did, mention_uri=dm_uri):
             remaining = await self.rate_limit_service.get_remaining(dm.sender_did)
             logger.warning(
                 "Rate limit exceeded for user %s (%s remaining)",
@@ -405,6 +428,24 @@ class Bot:
             )
             return False
 
+        succeeded = False
+        try:
+            succeeded = await self._respond_to_dm(dm)
+            return succeeded
+        finally:
+            # Only a delivered reply counts against the user's limit
+            self.rate_limit_service.settle(dm_uri, succeeded)
+
+    async def _respond_to_dm(self, dm: DirectMessage) -> bool:
+        """Handle a DM that passed the processed and rate limit checks.
+
+        Args:
+            dm: The DirectMessage to process.
+
+        Returns:
+            True if a reply was sent and recorded.
+        """
+
         logger.info(
             "Processing DM from @%s: %s",
             dm.sender_handle,
@@ -481,11 +522,6 @@ class Bot:
                 assistant_post_uri=f"dm://{dm.convo_id}/{reply_message_id}",
             )
 
-            # Record rate limit event (shared with mentions)
-            await self.rate_limit_service.record_request(
-                user_did=dm.sender_did, mention_uri=f"dm://{dm.convo_id}/{dm.message_id}"
-            )
-
             logger.info("Successfully replied to DM from @%s", dm.sender_handle)
             return True
 
@@ -536,6 +572,12 @@ class Bot:
             logger.error("Error in polling cycle: %s", e, exc_info=True)
             return 0
 
+    async def close(self) -> None:
+        """Flush background writes and release resources held by services."""
+        await self.rate_limit_service.close()
+        if self.selfimprovement_service is not None:
+            await self.selfimprovement_service.github.aclose()
+
     async def run(self) -> None:
         """Run the bot in a continuous polling loop."""
         logger.info("Starting bot for @%s", self.config.bluesky.handle)
@@ -3,6 +3,7 @@
 import re
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
 
@@ -56,7 +57,8 @@ class CommandRouter:
             >>> cmd.arguments
             'add tests'
         """
-        if not text:
+        # Plain chat never contains the prefix; skip the regex work entirely
+        if not text or self.COMMAND_PREFIX not in text:
             return None
 
         # Remove @bot-handle from the text (case insensitive)
@@ -114,15 +116,14 @@ class CommandRouter:
         Returns:
             Text with bot mention removed.
         """
-        # Try full handle first (e.g., @bot.bsky.social)
-        patterns = [
-            rf"@{re.escape(bot_handle)}\s*",
-            # Also try short handle (e.g., @bot from bot.bsky.social)
-            rf"@{re.escape(bot_handle.split('.')[0])}\s*",
-        ]
-
-        result = text
-        for pattern in patterns:
-            result = re.sub(pattern, "", result, flags=re.IGNORECASE)
-
-        return result
+        return _mention_pattern(bot_handle).sub("", text)
+
+
+@lru_cache(maxsize=16)
+def _mention_pattern(bot_handle: str) -> re.Pattern[str]:
+    """Compile the @mention pattern for a bot handle (the handle rarely changes)."""
+    # Try full handle first (e.g., @bot.bsky.social), then the
+    # short handle (e.g., @bot from bot.bsky.social)
+    full = re.escape(bot_handle)
+    short = re.escape(bot_handle.split(".")[0])
+    return re.compile(rf"@(?:{full}|{short})\s*", re.IGNORECASE)
@@ -39,6 +39,10 @@ class BotConfig(BaseModel):
         default="~/.atproto-bot/bot.db", description="Path to SQLite database file"
     )
     cleanup_old_data_days: int = Field(default=30, description="Clean up data older than N days")
+    db_pool_size: int = Field(default=5, ge=1, description="Persistent database connections")
+    db_max_overflow: int = Field(
+        default=10, ge=0, description="Extra connections allowed beyond the pool size"
+    )
 
 
 class GitHubConfig(BaseModel):
@@ -9,7 +9,7 @@ from pathlib import Path
 from .bot import Bot
 from .config import load_config
 from .llm_handler import LLMHandler
-from .services import get_db_service, init_db_service
+from .services import close_tool_execution_writer, get_db_service, init_db_service
 from .services.code_analysis_service import CodeAnalysisService
 from .services.git_service import GitService
 from .services.github_service import GitHubService
@@ -57,12 +57,12 @@ async def run_webhook_server(args, logger, config) -> None:
 
         # Initialize services
         llm_handler = LLMHandler(config.llm)
-        git_service = GitService(repo_path)
         github_service = GitHubService(
             app_id=config.github.app_id,
             private_key=config.github.private_key.get_secret_value(),
             installation_id=config.github.installation_id,
         )
+        git_service = GitService(repo_path, token=github_service.get_installation_token)
         code_analysis_service = CodeAnalysisService(
             llm=llm_handler.llm,  # Use underlying LLM from LLMHandler
             repo_path=repo_path,
@@ -96,7 +96,13 @@ async def run_webhook_server(args, logger, config) -> None:
             log_level="info" if args.verbose else "warning",
         )
         server = uvicorn.Server(uvicorn_config)
-        await server.serve()
+        try:
+            await server.serve()
+        finally:
+            await pr_improvement_service.close()
+            await github_service.aclose()
+            # Flush tool executions queued while handling webhooks
+            await close_tool_execution_writer()
 
     except ImportError:
         logger.error("uvicorn not installed. Install with: pip install uvicorn[standard]")
@@ -136,13 +142,18 @@ async def run_combined(args, logger, config) -> None:
 
 async def async_main(args, logger) -> int:
     """Async main function (polling mode)."""
+    bot = None
     try:
         logger.info("Loading configuration from %s", args.config)
         config = load_config(args.config)
 
         # Initialize database
         logger.info("Initializing database at %s", config.bot.database_path)
-        await init_db_service(config.bot.database_path)
+        await init_db_service(
+            config.bot.database_path,
+            pool_size=config.bot.db_pool_size,
+            max_overflow=config.bot.db_max_overflow,
+        )
         logger.info("Database initialized successfully")
 
         bot = Bot(config)
@@ -166,7 +177,11 @@ async def async_main(args, logger) -> int:
         logger.exception("Fatal error: %s", e)
         return 1
     finally:
-        # Clean up database connection
+        if bot is not None:
+            await bot.close()
+
+        # Flush queued tool executions, then clean up database connection
+        await close_tool_execution_writer()
         try:
             db = get_db_service()
             await db.close()
@@ -237,7 +252,11 @@ Examples:
 
             # Initialize database
             logger.info("Initializing database at %s", config.bot.database_path)
-            asyncio.run(init_db_service(config.bot.database_path))
+            asyncio.run(init_db_service(
+                config.bot.database_path,
+                pool_size=config.bot.db_pool_size,
+                max_overflow=config.bot.db_max_overflow,
+            ))
             logger.info("Database initialized successfully")
 
             return asyncio.run(run_webhook_server(args, logger, config))
@@ -253,7 +272,11 @@ Examples:
 
             # Initialize database
             logger.info("Initializing database at %s", config.bot.database_path)
-            asyncio.run(init_db_service(config.bot.database_path))
+            asyncio.run(init_db_service(
+                config.bot.database_path,
+                pool_size=config.bot.db_pool_size,
+                max_overflow=config.bot.db_max_overflow,
+            ))
             logger.info("Database initialized successfully")
 
             return asyncio.run(run_combined(args, logger, config))
@@ -26,4 +26,4 @@ class SqlalchemyBase(Base):
     updated_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
-    is_deleted: Mapped[bool] = mapped_column(Boolean, server_default=text("FALSE"), default=False)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, server_default=text("FALSE"))
@@ -2,7 +2,7 @@
 
 from typing import Optional
 
-from sqlalchemy import BigInteger, ForeignKey, Index, String
+from sqlalchemy import ForeignKey, Index, Integer, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import SqlalchemyBase
@@ -12,9 +12,21 @@ class ConversationHistory(SqlalchemyBase):
     """Store conversation history for context-aware responses."""
 
     __tablename__ = "conversation_history"
+    # Load server defaults (created_at etc.) via INSERT ... RETURNING, not a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
     __table_args__ = (
         Index("idx_conversation_thread_uri", "thread_uri"),
-        Index("idx_conversation_created_at", "created_at"),
+        # Live rows only; serves log search (newest-first) and cleanup.
+        # role/thread_uri ride along so the search summary never reads the table
+        # (is_deleted too: SQLite only treats the index as covering if it has it)
+        Index(
+            "idx_conversation_live_created_at",
+            "created_at",
+            "role",
+            "thread_uri",
+            "is_deleted",
+            sqlite_where=text("is_deleted = 0"),
+        ),
         Index("idx_conversation_sequence", "sequence_id", unique=True),
         Index("idx_conversation_mention_id", "mention_id"),
     )
@@ -27,4 +39,4 @@ class ConversationHistory(SqlalchemyBase):
     content: Mapped[str] = mapped_column(String, nullable=False)
     author_did: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     post_uri: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    sequence_id: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False)
+    sequence_id: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
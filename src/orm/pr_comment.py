@@ -2,7 +2,7 @@
 
 from typing import Optional
 
-from sqlalchemy import Boolean, Index, Integer, String, Text
+from sqlalchemy import Boolean, Index, Integer, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import SqlalchemyBase
@@ -26,7 +26,9 @@ class PRComment(SqlalchemyBase):
     commenter_login: Mapped[str] = mapped_column(String, nullable=False)
 
     # Processing state
-    processed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    processed: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default=text("FALSE")
+    )
 
     # Link to original self-improvement request (if applicable)
     selfimprovement_request_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
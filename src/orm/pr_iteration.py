@@ -13,7 +13,8 @@ class PRIteration(SqlalchemyBase):
 
     __tablename__ = "pr_iterations"
     __table_args__ = (
-        Index("idx_pr_iteration_pr_number", "pr_number"),
+        # Also serves pr_number lookups; MAX(iteration_number) per PR is a single seek
+        Index("idx_pr_iteration_pr_number_iteration", "pr_number", "iteration_number"),
         Index("idx_pr_iteration_comment_id", "comment_id"),
         Index("idx_pr_iteration_success", "success"),
         Index("idx_pr_iteration_created_at", "created_at"),
@@ -2,7 +2,7 @@
 
 from typing import Optional
 
-from sqlalchemy import Index, String
+from sqlalchemy import Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import SqlalchemyBase
@@ -12,14 +12,23 @@ class ProcessedDM(SqlalchemyBase):
     """Track processed DMs to prevent duplicate replies."""
 
     __tablename__ = "processed_dms"
+    # Load server defaults (created_at etc.) via INSERT ... RETURNING, not a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
     __table_args__ = (
         Index("idx_processed_dms_message_id", "message_id", unique=True),
         Index("idx_processed_dms_convo_id", "convo_id"),
         Index("idx_processed_dms_created_at", "created_at"),
+        # Live rows only, so cleanup never rescans old tombstones
+        Index(
+            "idx_processed_dms_live_created_at",
+            "created_at",
+            sqlite_where=text("is_deleted = 0"),
+        ),
     )
 
     convo_id: Mapped[str] = mapped_column(String, nullable=False)
-    message_id: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    # Uniqueness is enforced by idx_processed_dms_message_id (also the ON CONFLICT target)
+    message_id: Mapped[str] = mapped_column(String, nullable=False)
     sender_did: Mapped[str] = mapped_column(String, nullable=False)
     sender_handle: Mapped[str] = mapped_column(String, nullable=False)
     message_text: Mapped[str] = mapped_column(String, nullable=False)
@@ -2,7 +2,7 @@
 
 from typing import Optional
 
-from sqlalchemy import Index, String
+from sqlalchemy import Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import SqlalchemyBase
@@ -12,13 +12,27 @@ class ProcessedMention(SqlalchemyBase):
     """Track processed mentions to prevent duplicate replies."""
 
     __tablename__ = "processed_mentions"
+    # Load server defaults (created_at etc.) via INSERT ... RETURNING, not a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
     __table_args__ = (
         Index("idx_processed_mentions_mention_uri", "mention_uri", unique=True),
         Index("idx_processed_mentions_author_did", "author_did"),
         Index("idx_processed_mentions_created_at", "created_at"),
+        # Live rows only, so cleanup never rescans old tombstones.
+        # author_did/thread_uri ride along so the search summary never reads the table
+        # (is_deleted too: SQLite only treats the index as covering if it has it)
+        Index(
+            "idx_processed_mentions_live_created_at",
+            "created_at",
+            "author_did",
+            "thread_uri",
+            "is_deleted",
+            sqlite_where=text("is_deleted = 0"),
+        ),
     )
 
-    mention_uri: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    # Uniqueness is enforced by idx_processed_mentions_mention_uri (also the ON CONFLICT target)
+    mention_uri: Mapped[str] = mapped_column(String, nullable=False)
     author_did: Mapped[str] = mapped_column(String, nullable=False)
     author_handle: Mapped[str] = mapped_column(String, nullable=False)
     mention_text: Mapped[str] = mapped_column(String, nullable=False)
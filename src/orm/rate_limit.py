@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Index, String
+from sqlalchemy import DateTime, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import SqlalchemyBase
@@ -14,10 +14,20 @@ class RateLimitEvent(SqlalchemyBase):
 
     __tablename__ = "rate_limit_events"
     __table_args__ = (
-        Index("idx_rate_limit_user_did_timestamp", "user_did", "event_timestamp"),
-        Index("idx_rate_limit_event_timestamp", "event_timestamp"),
+        # Live events only; soft-deleted rows never count toward a limit
+        Index(
+            "idx_rate_limit_user_did_timestamp",
+            "user_did",
+            "event_timestamp",
+            sqlite_where=text("is_deleted = 0"),
+        ),
+        Index(
+            "idx_rate_limit_event_timestamp",
+            "event_timestamp",
+            sqlite_where=text("is_deleted = 0"),
+        ),
     )
 
-    user_did: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    user_did: Mapped[str] = mapped_column(String, nullable=False)
     event_timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     mention_uri: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -15,6 +15,8 @@ class SelfImprovementRequest(SqlalchemyBase):
     __table_args__ = (
         Index("idx_selfimprovement_requester_did", "requester_did"),
         Index("idx_selfimprovement_conversation_id", "conversation_id"),
+        # Webhook bot-PR checks and PR comment linking look requests up by PR
+        Index("idx_selfimprovement_pr_number", "pr_number"),
         Index("idx_selfimprovement_created_at", "created_at"),
     )
 
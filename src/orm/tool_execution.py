@@ -1,8 +1,8 @@
 """ToolExecution model for tracking tool usage."""
 
-from typing import Optional
+from typing import Any, Optional
 
-from sqlalchemy import Boolean, Index, Integer, String, Text
+from sqlalchemy import JSON, Boolean, Index, Integer, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import SqlalchemyBase
@@ -15,13 +15,24 @@ class ToolExecution(SqlalchemyBase):
     __table_args__ = (
         Index("idx_tool_executions_conversation", "conversation_id"),
         Index("idx_tool_executions_tool_name", "tool_name"),
-        Index("idx_tool_executions_created_at", "created_at"),
+        # Live rows only; log search walks it newest-first and stops at its LIMIT.
+        # tool_name/success ride along so the per-tool summary never reads the table
+        # (is_deleted too: SQLite only treats the index as covering if it has it)
+        Index(
+            "idx_tool_executions_live_created_at",
+            "created_at",
+            "tool_name",
+            "success",
+            "is_deleted",
+            sqlite_where=text("is_deleted = 0"),
+        ),
     )
 
     conversation_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     tool_name: Mapped[str] = mapped_column(String, nullable=False)
     tool_call_id: Mapped[str] = mapped_column(String, nullable=False)
-    input_args: Mapped[str] = mapped_column(Text, nullable=False)  # JSON string
+    # Large, rarely read columns are deferred; use undefer() in queries that need them
+    input_args: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, deferred=True)
     output_result: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     success: Mapped[bool] = mapped_column(Boolean, nullable=False)
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -32,4 +43,4 @@ class ToolExecution(SqlalchemyBase):
     cache_creation_input_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     cache_read_input_tokens: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     # Extended thinking content for debugging
-    thinking_content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    thinking_content: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True)
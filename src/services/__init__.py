@@ -1,19 +1,29 @@
 """Service layer for business logic and database operations."""
 
+from .batch_writer import BatchInsertWriter
 from .conversation_service import ConversationService
 from .database import DatabaseService, get_db_service, init_db_service
 from .dm_service import DMService
 from .mention_service import MentionService
 from .rate_limit_service import RateLimitService
-from .tool_service import ToolService
+from .tool_service import (
+    ToolExecutionWriter,
+    ToolService,
+    close_tool_execution_writer,
+    get_tool_execution_writer,
+)
 
 __all__ = [
+    "BatchInsertWriter",
     "ConversationService",
     "DatabaseService",
     "DMService",
     "MentionService",
     "RateLimitService",
+    "ToolExecutionWriter",
     "ToolService",
+    "close_tool_execution_writer",
     "get_db_service",
+    "get_tool_execution_writer",
     "init_db_service",
 ]
@@ -0,0 +1,152 @@
+"""Background writer that coalesces single-row INSERTs into batches."""
+
+import asyncio
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import insert
+
+from ..orm.base import Base
+from .database import DatabaseService, get_db_service
+
+logger = logging.getLogger(__name__)
+
+
+class BatchInsertWriter:
+    """Buffer rows for one model and insert them in batches.
+
+    A batch is written every ``max_batch_size`` rows or every ``flush_interval``
+    seconds, whichever comes first, as a single executemany INSERT.
+    """
+
+    def __init__(
+        self,
+        model: type[Base],
+        max_batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 0,
+        db_service: Optional[DatabaseService] = None,
+    ):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        # Falls back to the global database service when not injected
+        self._db = db_service
+        # None is the shutdown sentinel; max_queue_size=0 leaves the queue unbounded
+        self._queue: asyncio.Queue[Optional[dict[str, Any]]] = asyncio.Queue(max_queue_size)
+        self._batch_ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        # Rows that could not be inserted even on their own
+        self.dropped_rows = 0
+
+    def submit(self, row: dict[str, Any]) -> None:
+        """Queue a row for insertion, starting the background writer if needed.
+
+        Raises:
+            asyncio.QueueFull: If the queue is bounded and full; use put() to wait instead.
+        """
+        self._ensure_running()
+        self._queue.put_nowait(row)
+        self._signal_if_full()
+
+    async def put(self, row: dict[str, Any]) -> None:
+        """Queue a row for insertion, waiting for room if the queue is full."""
+        self._ensure_running()
+        if self._queue.full():
+            # Flush now rather than waiting out the interval
+            self._batch_ready.set()
+        await self._queue.put(row)
+        self._signal_if_full()
+
+    async def close(self) -> None:
+        """Flush pending rows and stop the background writer."""
+        if self._task is None or self._task.done():
+            return
+
+        # Drain what is queued without waiting out the flush interval
+        self._closing = True
+        self._batch_ready.set()
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        self._closing = False
+
+    def _ensure_running(self) -> None:
+        """Start the background writer if it is not running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def _signal_if_full(self) -> None:
+        """Wake the writer once a full batch is waiting."""
+        if self._queue.full() or self._queue.qsize() >= self.max_batch_size:
+            self._batch_ready.set()
+
+    async def _run(self) -> None:
+        """Drain the queue in batches until the shutdown sentinel is seen."""
+        while True:
+            batch: list[dict[str, Any]] = []
+            row = await self._queue.get()
+
+            # Give the batch time to fill unless it is already full
+            if (
+                row is not None
+                and not self._closing
+                and not self._queue.full()
+                and self._queue.qsize() < self.max_batch_size - 1
+            ):
+                self._batch_ready.clear()
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+            stopping = row is None
+            while row is not None:
+                batch.append(row)
+                if len(batch) >= self.max_batch_size or self._queue.empty():
+                    break
+                row = self._queue.get_nowait()
+                stopping = row is None
+
+            if batch:
+                await self._insert(batch)
+            if stopping:
+                return
+
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        """Insert a batch of rows in one statement.
+
+        If the batch fails, the rows are retried one at a time so a single bad
+        row doesn't take the rest of the batch with it. Rows that still fail
+        are logged and counted in ``dropped_rows``.
+        """
+        table = self.model.__tablename__
+        try:
+            db = self._db or get_db_service()
+        except RuntimeError as e:
+            self.dropped_rows += len(rows)
+            logger.error("Failed to insert %d rows into %s: %s", len(rows), table, e)
+            return
+
+        try:
+            async with db.session() as session:
+                await session.execute(insert(self.model), rows)
+            logger.debug("Inserted %d rows into %s", len(rows), table)
+            return
+        except Exception as e:
+            if len(rows) == 1:
+                self.dropped_rows += 1
+                logger.error("Failed to insert row into %s: %s", table, e, exc_info=True)
+                return
+            logger.warning(
+                "Failed to insert %d rows into %s, retrying row by row: %s", len(rows), table, e
+            )
+
+        for row in rows:
+            try:
+                async with db.session() as session:
+                    await session.execute(insert(self.model), [row])
+            except Exception as e:
+                self.dropped_rows += 1
+                logger.error("Failed to insert row into %s: %s", table, e, exc_info=True)
@@ -1,18 +1,100 @@
 """Code analysis service using Claude for code generation."""
 
 import ast
-import json
+import asyncio
 import logging
 import os
 import re
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
+import orjson
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage, SystemMessage
 
 logger = logging.getLogger(__name__)
 
+# Directories never included in the codebase context (hidden entries are skipped separately)
+_SKIP_DIRS = frozenset({"__pycache__", "node_modules", "venv"})
+
+# Markdown code fence wrapped around a JSON response
+_FENCED_JSON = re.compile(r"\A\s*```(?:json)?\s*(.*?)\s*```\s*\Z", re.DOTALL)
+
+# Builtins flagged by validation when called in generated code
+_DANGEROUS_CALLS = frozenset({"eval", "exec", "compile", "__import__"})
+
+
+def _find_dangerous_calls(tree: ast.AST) -> set[str]:
+    """Return names of dangerous builtins called anywhere in a parsed module."""
+    found = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        if isinstance(func, ast.Name) and func.id in _DANGEROUS_CALLS:
+            found.add(func.id)
+        elif isinstance(func, ast.Attribute) and func.attr in ("eval", "exec"):
+            # e.g. builtins.eval(...) / __builtins__.exec(...)
+            found.add(func.attr)
+    return found
+
+
+def _validate_python_file(path_str: str) -> tuple[str, str, list[str]]:
+    """
+    Validate a single Python file.
+
+    Returns:
+        (path, error_message, dangerous_calls) where error_message is empty on success.
+    """
+    # Check file size (< 10MB)
+    if os.path.getsize(path_str) > 10 * 1024 * 1024:
+        return (path_str, f"File too large: {path_str} (>10MB)", [])
+
+    # Check Python syntax
+    try:
+        with open(path_str, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+    except SyntaxError as e:
+        return (path_str, f"Syntax error in {path_str}: {e}", [])
+
+    return (path_str, "", sorted(_find_dangerous_calls(tree)))
+
+
+def _write_file(file_path: Path, content: str) -> None:
+    """Write file content, creating parent directories as needed."""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_bytes(content.encode("utf-8"))
+    logger.debug("Wrote file: %s", file_path)
+
+
+def _delete_file(file_path: Path) -> None:
+    """Delete a file if it exists."""
+    if file_path.exists():
+        file_path.unlink()
+        logger.debug("Deleted file: %s", file_path)
+    else:
+        logger.warning("Cannot delete non-existent file: %s", file_path)
+
+
+def _validate_python_files(path_strs: list[str]) -> list[tuple[str, str, list[str]]]:
+    """
+    Validate Python files in order, stopping at the first error (runs in a thread).
+
+    Args:
+        path_strs: Absolute paths of the files to check.
+
+    Returns:
+        One _validate_python_file result per file checked; the last holds any error.
+    """
+    results = []
+    for path_str in path_strs:
+        result = _validate_python_file(path_str)
+        results.append(result)
+        if result[1]:
+            break
+    return results
+
 
 class CodeAnalysisService:
     """Claude-powered code analysis and generation."""
@@ -27,6 +109,8 @@ class CodeAnalysisService:
         """
         self.llm = llm
         self.repo_path = Path(repo_path).expanduser().resolve()
+        # (size, mtime_ns) of files that last passed validation
+        self._validated_files: dict[Path, tuple[int, int]] = {}
         logger.debug("CodeAnalysisService initialized for repo: %s", self.repo_path)
 
     async def analyze_and_generate_changes(
@@ -129,37 +213,50 @@ class CodeAnalysisService:
 
     def _get_directory_tree(self) -> str:
         """Get directory tree structure."""
-        tree_lines = ["```"]
-
-        # Walk the directory structure
-        for root, dirs, files in os.walk(self.repo_path):
-            # Skip hidden and common ignored directories
-            dirs[:] = [d for d in dirs if not d.startswith(".") and d not in ["__pycache__", "node_modules", ".git"]]
-
-            level = root.replace(str(self.repo_path), "").count(os.sep)
-            indent = "  " * level
-            rel_root = os.path.relpath(root, self.repo_path)
-            if rel_root == ".":
-                tree_lines.append(f"{self.repo_path.name}/")
-            else:
-                tree_lines.append(f"{indent}{os.path.basename(root)}/")
-
-            sub_indent = "  " * (level + 1)
-            for file in sorted(files):
-                if not file.startswith("."):
-                    tree_lines.append(f"{sub_indent}{file}")
-
-        tree_lines.append("```")
-        return "\n".join(tree_lines)
+        lines: list[tuple[int, str]] = []
+
+        # Iterative depth-first scan; scandir yields entry types without extra stat calls
+        stack: list[tuple[str, int, str]] = [(str(self.repo_path), 0, self.repo_path.name)]
+        while stack:
+            directory, depth, dir_name = stack.pop()
+            lines.append((depth, f"{dir_name}/"))
+
+            subdirs: list[tuple[str, str]] = []
+            files: list[str] = []
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        name = entry.name
+                        # Skip hidden entries and common ignored directories
+                        if name[0] == "." or name in _SKIP_DIRS:
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append((name, entry.path))
+                        else:
+                            files.append(name)
+            except OSError as e:
+                logger.debug("Skipping unreadable directory %s: %s", directory, e)
+                continue
+
+            files.sort()
+            lines.extend((depth + 1, name) for name in files)
+
+            # Push in reverse so subdirectories are visited alphabetically
+            subdirs.sort(reverse=True)
+            stack.extend((path, depth + 1, name) for name, path in subdirs)
+
+        tree = "\n".join("  " * depth + name for depth, name in lines)
+        return f"```\n{tree}\n```"
 
     def _read_file_safe(self, file_path: Path, max_lines: int = 500) -> str:
         """Safely read file content with size limit."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-                if len(lines) > max_lines:
-                    return "".join(lines[:max_lines]) + f"\n... (truncated, {len(lines)} total lines)"
-                return "".join(lines)
+            with open(file_path, "r", encoding="utf-8", buffering=65536) as f:
+                # Read at most one line past the limit instead of the whole file
+                lines = list(islice(f, max_lines + 1))
+            if len(lines) > max_lines:
+                return "".join(lines[:max_lines]) + f"\n... (truncated after {max_lines} lines)"
+            return "".join(lines)
         except Exception as e:
             logger.warning("Failed to read file %s: %s", file_path, e)
             return ""
@@ -232,17 +329,17 @@ Remember: Respond with ONLY the JSON object, no markdown code blocks or addition
             ValueError: If JSON parsing fails.
         """
         # Remove markdown code blocks if present (Claude sometimes adds them)
-        cleaned = response_text.strip()
-        if cleaned.startswith("```json"):
-            cleaned = cleaned[7:]
-        if cleaned.startswith("```"):
-            cleaned = cleaned[3:]
-        if cleaned.endswith("```"):
-            cleaned = cleaned[:-3]
-        cleaned = cleaned.strip()
+        match = _FENCED_JSON.match(response_text)
+        cleaned = match.group(1) if match else response_text.strip()
+
+        # Drop any prose around the JSON object
+        start = cleaned.find("{")
+        end = cleaned.rfind("}")
+        if start != -1 and end > start:
+            cleaned = cleaned[start : end + 1]
 
         try:
-            result = json.loads(cleaned)
+            result = orjson.loads(cleaned)
 
             # Validate structure
             required_keys = ["success", "changes", "explanation", "branch_name", "commit_message", "pr_title", "pr_body"]
@@ -251,7 +348,7 @@ Remember: Respond with ONLY the JSON object, no markdown code blocks or addition
                     raise ValueError(f"Missing required key: {key}")
 
             return result
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error("Failed to parse JSON response: %s", e)
             logger.debug("Response text: %s", response_text)
             raise ValueError(f"Invalid JSON response: {e}")
@@ -269,30 +366,29 @@ Remember: Respond with ONLY the JSON object, no markdown code blocks or addition
         logger.info("Applying %d file changes...", len(changes))
 
         try:
+            # Only the last action on a path decides its final state, so keep that one;
+            # the remaining operations touch distinct files and can run in any order
+            final: dict[Path, dict[str, Any]] = {}
             for change in changes:
-                file_path = self.repo_path / change["file_path"]
+                file_path = (self.repo_path / change["file_path"]).resolve()
                 action = change["action"]
 
-                if action == "create" or action == "modify":
-                    # Ensure parent directory exists
-                    file_path.parent.mkdir(parents=True, exist_ok=True)
-
-                    # Write content
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        f.write(change["content"])
-
-                    logger.debug("Wrote file: %s", file_path)
-
-                elif action == "delete":
-                    if file_path.exists():
-                        file_path.unlink()
-                        logger.debug("Deleted file: %s", file_path)
-                    else:
-                        logger.warning("Cannot delete non-existent file: %s", file_path)
-
+                if action in ("create", "modify", "delete"):
+                    final.pop(file_path, None)
+                    final[file_path] = change
                 else:
                     logger.warning("Unknown action '%s' for file %s", action, file_path)
 
+            # Run blocking filesystem calls in worker threads, concurrently
+            await asyncio.gather(
+                *(
+                    asyncio.to_thread(_delete_file, path)
+                    if change["action"] == "delete"
+                    else asyncio.to_thread(_write_file, path, change["content"])
+                    for path, change in final.items()
+                )
+            )
+
             logger.info("Successfully applied all changes")
             return (True, "")
 
@@ -301,7 +397,9 @@ Remember: Respond with ONLY the JSON object, no markdown code blocks or addition
             logger.error(error_msg, exc_info=True)
             return (False, error_msg)
 
-    async def validate_changes(self) -> tuple[bool, str]:
+    async def validate_changes(
+        self, changes: list[dict[str, Any]] | None = None
+    ) -> tuple[bool, str]:
         """
         Validate applied changes.
 
@@ -310,33 +408,46 @@ Remember: Respond with ONLY the JSON object, no markdown code blocks or addition
         - No dangerous imports
         - File size limits
 
+        Only the Python files touched by ``changes`` are checked; without
+        ``changes`` every Python file in the repo is checked. Files whose size
+        and mtime are unchanged since they last passed are skipped.
+
+        Args:
+            changes: Change dicts that were passed to apply_changes.
+
         Returns:
             (valid, error_message).
         """
         logger.info("Validating changes...")
 
         try:
-            # Find all Python files in the repo
-            for py_file in self.repo_path.rglob("*.py"):
-                # Skip virtual environments and hidden directories
-                if any(part.startswith(".") or part == "__pycache__" for part in py_file.parts):
-                    continue
-
-                # Check file size (< 10MB)
-                if py_file.stat().st_size > 10 * 1024 * 1024:
-                    return (False, f"File too large: {py_file} (>10MB)")
-
-                # Check Python syntax
-                try:
-                    with open(py_file, "r", encoding="utf-8") as f:
-                        code = f.read()
-                    ast.parse(code)
-                except SyntaxError as e:
-                    return (False, f"Syntax error in {py_file}: {e}")
-
-                # Check for dangerous imports (warning only)
-                if re.search(r'\b(eval|exec)\s*\(', code):
-                    logger.warning("Found potentially dangerous code in %s: eval/exec usage", py_file)
+            # Skip files that are unchanged since they last passed validation
+            pending: dict[Path, tuple[int, int]] = {}
+            for py_file in self._python_files_to_validate(changes):
+                stat = py_file.stat()
+                signature = (stat.st_size, stat.st_mtime_ns)
+                if self._validated_files.get(py_file) != signature:
+                    pending[py_file] = signature
+
+            if pending:
+                # Parse off the event loop; only files changed since the last pass remain
+                results = await asyncio.to_thread(
+                    _validate_python_files, [str(py_file) for py_file in pending]
+                )
+                for path_str, error, dangerous in results:
+                    if error:
+                        return (False, error)
+
+                    # Check for dangerous calls (warning only)
+                    if dangerous:
+                        logger.warning(
+                            "Found potentially dangerous code in %s: %s usage",
+                            path_str,
+                            "/".join(dangerous),
+                        )
+
+                    py_file = Path(path_str)
+                    self._validated_files[py_file] = pending[py_file]
 
             logger.info("Validation passed")
             return (True, "")
@@ -345,3 +456,19 @@ Remember: Respond with ONLY the JSON object, no markdown code blocks or addition
             error_msg = f"Validation failed: {e}"
             logger.error(error_msg, exc_info=True)
             return (False, error_msg)
+
+    def _python_files_to_validate(self, changes: list[dict[str, Any]] | None) -> list[Path]:
+        """List Python files that need validation for the given changes."""
+        if changes is None:
+            # Skip virtual environments and hidden directories
+            return [
+                py_file
+                for py_file in self.repo_path.rglob("*.py")
+                if not any(part.startswith(".") or part == "__pycache__" for part in py_file.parts)
+            ]
+
+        return [
+            self.repo_path / change["file_path"]
+            for change in changes
+            if change["action"] in ("create", "modify") and change["file_path"].endswith(".py")
+        ]
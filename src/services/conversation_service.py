@@ -54,8 +54,6 @@ class ConversationService:
             session.add(user_entry)
             session.add(assistant_entry)
             await session.commit()
-            await session.refresh(user_entry)
-            await session.refresh(assistant_entry)
 
             return user_entry, assistant_entry
 
@@ -2,8 +2,9 @@
 
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
+import orjson
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -13,11 +14,28 @@ from sqlalchemy.ext.asyncio import (
 
 from ..orm.base import Base
 
+# Connection pool defaults (SQLAlchemy's own). SQLite serializes writers on the
+# file lock, so a bigger pool only adds file handles and aiosqlite threads.
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+# Seconds to wait for a free connection before raising
+POOL_TIMEOUT = 30
+
+
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON columns with orjson."""
+    return orjson.dumps(value).decode("utf-8")
+
 
 class DatabaseService:
     """Manages database connection and session lifecycle."""
 
-    def __init__(self, database_path: str | Path):
+    def __init__(
+        self,
+        database_path: str | Path,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_overflow: int = DEFAULT_MAX_OVERFLOW,
+    ):
         self.database_path = Path(database_path).expanduser()
         self.database_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -26,7 +44,11 @@ class DatabaseService:
         self.engine: AsyncEngine = create_async_engine(
             db_url,
             echo=False,
-            pool_pre_ping=True,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=POOL_TIMEOUT,
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
         )
 
         self.async_session_factory = async_sessionmaker(
@@ -55,6 +77,14 @@ class DatabaseService:
             finally:
                 await session.close()
 
+    def read_session(self) -> AsyncSession:
+        """Provide a session for read-only work.
+
+        Use as ``async with db.read_session() as session``. Nothing is committed;
+        closing the session just releases its connection.
+        """
+        return self.async_session_factory()
+
     async def close(self):
         """Close database engine."""
         await self.engine.dispose()
@@ -71,9 +101,13 @@ def get_db_service() -> DatabaseService:
     return db_service
 
 
-async def init_db_service(database_path: str | Path) -> DatabaseService:
+async def init_db_service(
+    database_path: str | Path,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    max_overflow: int = DEFAULT_MAX_OVERFLOW,
+) -> DatabaseService:
     """Initialize the global database service."""
     global db_service
-    db_service = DatabaseService(database_path)
+    db_service = DatabaseService(database_path, pool_size=pool_size, max_overflow=max_overflow)
     await db_service.initialize()
     return db_service
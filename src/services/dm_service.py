@@ -1,28 +1,49 @@
 """Service for managing processed DMs."""
 
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Optional
 
-from sqlalchemy import select
+from sqlalchemy import exists, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..orm.processed_dm import ProcessedDM
 from .database import get_db_service
+from .processed_cache import ProcessedCache
+
+# Rows soft-deleted per transaction during cleanup
+CLEANUP_BATCH_SIZE = 5_000
 
 
 class DMService:
     """Service for managing processed direct messages."""
 
+    def __init__(self):
+        # Repeat lookups of processed items skip the database; misses always query it
+        self._cache = ProcessedCache()
+
     async def is_processed(self, message_id: str) -> bool:
         """Check if a DM has already been processed."""
+        cached = self._cache.lookup(message_id)
+        if cached is not None:
+            return cached
+
         db = get_db_service()
         async with db.session() as session:
-            result = await session.execute(
-                select(ProcessedDM).where(
-                    ProcessedDM.message_id == message_id,
-                    ProcessedDM.is_deleted == False,  # noqa: E712
+            # Pure EXISTS: the database answers a boolean, no row is hydrated
+            found = await session.scalar(
+                select(
+                    exists().where(
+                        ProcessedDM.message_id == message_id,
+                        ProcessedDM.is_deleted == False,  # noqa: E712
+                    )
                 )
             )
-            return result.scalar_one_or_none() is not None
+            if not found:
+                return False
+
+        self._cache.add(message_id)
+        return True
 
     async def mark_processed(
         self,
@@ -32,36 +53,121 @@ class DMService:
         sender_handle: str,
         message_text: str,
         reply_message_id: Optional[str] = None,
+        session: Optional[AsyncSession] = None,
     ) -> ProcessedDM:
-        """Mark a DM as processed."""
+        """Mark a DM as processed.
+
+        If ``session`` is given the row is added to the caller's transaction and
+        committed with it; otherwise a session is opened and committed here.
+        """
+        dm = ProcessedDM(
+            convo_id=convo_id,
+            message_id=message_id,
+            sender_did=sender_did,
+            sender_handle=sender_handle,
+            message_text=message_text,
+            reply_message_id=reply_message_id,
+        )
+        if session is not None:
+            session.add(dm)
+            # Cached only if the caller's transaction actually commits
+            self._cache.add_on_commit(session, message_id)
+            return dm
+
         db = get_db_service()
         async with db.session() as session:
-            dm = ProcessedDM(
-                convo_id=convo_id,
-                message_id=message_id,
-                sender_did=sender_did,
-                sender_handle=sender_handle,
-                message_text=message_text,
-                reply_message_id=reply_message_id,
-            )
             session.add(dm)
             await session.commit()
-            await session.refresh(dm)
-            return dm
+
+        self._cache.add(message_id)
+        return dm
+
+    async def claim(
+        self,
+        convo_id: str,
+        message_id: str,
+        sender_did: str,
+        sender_handle: str,
+        message_text: str,
+        reply_message_id: Optional[str] = None,
+    ) -> bool:
+        """Atomically mark a DM as processed unless it already is.
+
+        Uses a single INSERT ... ON CONFLICT DO NOTHING, so concurrent
+        deliveries of the same DM cannot both claim it.
+
+        Returns:
+            True if this call inserted the row, False if it already existed.
+        """
+        db = get_db_service()
+        async with db.session() as session:
+            inserted_id = await session.scalar(
+                sqlite_insert(ProcessedDM)
+                .values(
+                    convo_id=convo_id,
+                    message_id=message_id,
+                    sender_did=sender_did,
+                    sender_handle=sender_handle,
+                    message_text=message_text,
+                    reply_message_id=reply_message_id,
+                )
+                .on_conflict_do_nothing(index_elements=["message_id"])
+                .returning(ProcessedDM.id)
+            )
+
+        if inserted_id is None:
+            return False
+
+        self._cache.add(message_id)
+        return True
+
+    async def mark_processed_many(self, dms: list[dict[str, Any]]) -> None:
+        """Mark a batch of DMs as processed in a single transaction.
+
+        Each dict holds the keyword arguments accepted by ``mark_processed``.
+        """
+        if not dms:
+            return
+
+        db = get_db_service()
+        async with db.session() as session:
+            await session.execute(insert(ProcessedDM), dms)
+
+        for row in dms:
+            self._cache.add(row["message_id"])
 
     async def cleanup_old_dms(self, days: int = 30):
         """Clean up DMs older than N days (soft delete)."""
         db = get_db_service()
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
 
-        async with db.session() as session:
-            result = await session.execute(
-                select(ProcessedDM).where(
-                    ProcessedDM.created_at < cutoff,
-                    ProcessedDM.is_deleted == False,  # noqa: E712
+        # Soft delete in bounded batches so each transaction stays short. Each
+        # batch walks the live-rows partial index from the oldest entry; rows
+        # already soft-deleted drop out of that index, so it doubles as the
+        # cursor and old tombstones are never rescanned.
+        while True:
+            async with db.session() as session:
+                batch = (
+                    select(ProcessedDM.id)
+                    .where(
+                        ProcessedDM.created_at < cutoff,
+                        ProcessedDM.is_deleted == False,  # noqa: E712
+                    )
+                    .order_by(ProcessedDM.created_at)
+                    .limit(CLEANUP_BATCH_SIZE)
                 )
-            )
-            old_dms = result.scalars().all()
-            for dm in old_dms:
-                dm.is_deleted = True
-            await session.commit()
+                result = await session.execute(
+                    update(ProcessedDM)
+                    .where(ProcessedDM.id.in_(batch.scalar_subquery()))
+                    .values(is_deleted=True)
+                    .returning(ProcessedDM.id)
+                    .execution_options(synchronize_session=False)
+                )
+                ids = result.scalars().all()
+                await session.commit()
+
+            if len(ids) < CLEANUP_BATCH_SIZE:
+                break
+
+        # Soft-deleted IDs must no longer be reported as processed
+        self._cache.clear()
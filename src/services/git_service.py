@@ -1,32 +1,94 @@
 """Git operations service for code modifications."""
 
 import asyncio
+import base64
 import logging
+import os
+import signal
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+try:
+    import pygit2
+except ImportError:  # Optional: fall back to the git CLI for every command
+    pygit2 = None
 
 logger = logging.getLogger(__name__)
 
+# Remote prefix whose HTTPS requests carry the access token
+AUTH_URL_PREFIX = "https://github.com/"
+
 
 class GitService:
     """Git operations for self-improvement workflow."""
 
-    def __init__(self, repo_path: Path | str):
+    def __init__(
+        self,
+        repo_path: Path | str,
+        token: Optional[Callable[[], Awaitable[str]]] = None,
+    ):
         """
         Initialize Git service.
 
         Args:
             repo_path: Path to the local git repository.
+            token: Optional coroutine function returning an access token (e.g. a
+                GitHub App installation token) that authenticates every git
+                command that may reach the remote.
         """
         self.repo_path = Path(repo_path).expanduser().resolve()
+        self._token = token
+        self._repo: Any = None
+        # Caps concurrent git subprocesses when callers fan out
+        self._git_sem = asyncio.Semaphore(4)
+        self._clone_ready = False
         logger.debug("GitService initialized with repo path: %s", self.repo_path)
 
-    async def _run_git_command(self, *args: str) -> tuple[int, str, str]:
+    def _get_repo(self) -> Any:
+        """
+        Get a long-lived pygit2 Repository for read-only queries.
+
+        Returns:
+            pygit2.Repository, or None if pygit2 is unavailable or the repo can't be opened.
+        """
+        if self._repo is None and pygit2 is not None:
+            try:
+                self._repo = pygit2.Repository(str(self.repo_path))
+            except Exception as e:
+                logger.debug("pygit2 unavailable for %s, using git CLI: %s", self.repo_path, e)
+        return self._repo
+
+    async def _git_env(self) -> Optional[dict[str, str]]:
+        """
+        Build the environment for git commands that may reach the remote.
+
+        The token is passed as an Authorization header through git's GIT_CONFIG_*
+        variables, so it never shows up in argv or gets stored in .git/config.
+        This covers explicit fetch/push as well as the blob fetches a partial
+        clone makes lazily during checkout and diff.
+
+        Returns:
+            Environment with the auth header, or None (inherit) without a token.
+        """
+        if self._token is None:
+            return None
+        credentials = base64.b64encode(f"x-access-token:{await self._token()}".encode()).decode()
+        return {
+            **os.environ,
+            "GIT_CONFIG_COUNT": "1",
+            "GIT_CONFIG_KEY_0": f"http.{AUTH_URL_PREFIX}.extraHeader",
+            "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials}",
+        }
+
+    async def _run_git_command(
+        self, *args: str, cwd: Optional[Path] = None
+    ) -> tuple[int, str, str]:
         """
         Run git command and return (returncode, stdout, stderr).
 
         Args:
             *args: Git command arguments (e.g., "status", "--porcelain").
+            cwd: Directory to run in (default: the repository).
 
         Returns:
             Tuple of (return_code, stdout, stderr).
@@ -35,17 +97,22 @@ class GitService:
             Exception: If subprocess creation fails.
         """
         cmd = ["git", *args]
-        logger.debug("Running git command: %s", " ".join(cmd))
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Running git command: %s", " ".join(cmd))
 
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=self.repo_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
+            env = await self._git_env()
+            async with self._git_sem:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    cwd=cwd or self.repo_path,
+                    env=env,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                stdout_bytes, stderr_bytes = await process.communicate()
 
-            stdout_bytes, stderr_bytes = await process.communicate()
             stdout = stdout_bytes.decode("utf-8", errors="replace")
             stderr = stderr_bytes.decode("utf-8", errors="replace")
 
@@ -58,7 +125,7 @@ class GitService:
                     " ".join(cmd),
                     stderr,
                 )
-            else:
+            elif debug:
                 logger.debug("Git command succeeded: %s", " ".join(cmd))
 
             return (returncode, stdout, stderr)
@@ -67,6 +134,31 @@ class GitService:
             logger.error("Failed to run git command %s: %s", " ".join(cmd), e)
             raise
 
+    async def _run_git_quick(self, *args: str) -> tuple[int, str]:
+        """
+        Run a small read-only git command and return (returncode, stdout).
+
+        Reads stdout directly instead of using communicate(), and discards
+        stderr, for metadata queries where only the output matters.
+
+        Args:
+            *args: Git command arguments (e.g., "rev-parse", "HEAD").
+
+        Returns:
+            Tuple of (return_code, stdout).
+        """
+        async with self._git_sem:
+            process = await asyncio.create_subprocess_exec(
+                "git",
+                *args,
+                cwd=self.repo_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            stdout_bytes = await process.stdout.read()
+            returncode = await process.wait()
+        return (returncode, stdout_bytes.decode("utf-8", errors="replace"))
+
     async def ensure_clean_state(self) -> bool:
         """
         Ensure working directory is clean (no uncommitted changes).
@@ -75,10 +167,21 @@ class GitService:
             True if working directory is clean, False otherwise.
         """
         logger.debug("Checking git working directory state...")
-        returncode, stdout, stderr = await self._run_git_command("status", "--porcelain")
+
+        repo = self._get_repo()
+        if repo is not None:
+            status = await asyncio.to_thread(repo.status)
+            dirty = [path for path, flags in status.items() if flags != pygit2.GIT_STATUS_CURRENT]
+            if dirty:
+                logger.warning("Working directory is not clean:\n%s", "\n".join(dirty))
+                return False
+            logger.debug("Working directory is clean")
+            return True
+
+        returncode, stdout = await self._run_git_quick("status", "--porcelain")
 
         if returncode != 0:
-            logger.error("Failed to check git status: %s", stderr)
+            logger.error("Failed to check git status (exit code %d)", returncode)
             return False
 
         is_clean = len(stdout.strip()) == 0
@@ -89,9 +192,51 @@ class GitService:
 
         return is_clean
 
+    async def ensure_cached_clone(self, repository: str) -> bool:
+        """
+        Make sure the persistent working clone exists, cloning it on first use.
+
+        The clone is partial (--filter=blob:none): history is fetched up front,
+        file contents on demand. Once it exists, only pull_latest's branch
+        fetches (and lazy blob fetches) touch the network.
+
+        Args:
+            repository: Repository name in format "owner/repo".
+
+        Returns:
+            True if the clone is ready, False if cloning failed.
+        """
+        if self._clone_ready:
+            return True
+        if (self.repo_path / ".git").exists():
+            self._clone_ready = True
+            return True
+
+        logger.info("Cloning %s into %s...", repository, self.repo_path)
+        self.repo_path.parent.mkdir(parents=True, exist_ok=True)
+
+        returncode, stdout, stderr = await self._run_git_command(
+            "clone",
+            "--filter=blob:none",
+            "--no-checkout",
+            f"{AUTH_URL_PREFIX}{repository}.git",
+            str(self.repo_path),
+            cwd=self.repo_path.parent,
+        )
+        if returncode != 0:
+            logger.error("Failed to clone %s: %s", repository, stderr)
+            return False
+
+        self._clone_ready = True
+        logger.info("Cloned %s", repository)
+        return True
+
     async def pull_latest(self, branch: str = "main") -> bool:
         """
-        Pull latest changes from remote branch.
+        Check out a branch at the latest commit from the remote.
+
+        The local branch is reset to origin/<branch>, so this also switches
+        to the branch; callers don't need a separate checkout.
 
         Args:
             branch: Branch to pull from (default: main).
@@ -101,19 +246,75 @@ class GitService:
         """
         logger.info("Pulling latest changes from origin/%s...", branch)
 
-        # First, checkout the branch
-        returncode, stdout, stderr = await self._run_git_command("checkout", branch)
+        if not await self.fetch_branch(branch):
+            return False
+        if not await self.checkout_remote_branch(branch):
+            return False
+
+        logger.info("Successfully pulled latest changes from origin/%s", branch)
+        return True
+
+    async def fetch_branch(self, branch: str = "main") -> bool:
+        """
+        Fetch a single branch from the remote without touching the working tree.
+
+        Args:
+            branch: Branch to fetch (default: main).
+
+        Returns:
+            True if fetch succeeded, False otherwise.
+        """
+        returncode, stdout, stderr = await self._run_git_command("fetch", "origin", branch)
         if returncode != 0:
-            logger.error("Failed to checkout %s: %s", branch, stderr)
+            logger.error("Failed to fetch origin/%s: %s", branch, stderr)
             return False
+        return True
+
+    async def checkout_remote_branch(self, branch: str = "main") -> bool:
+        """
+        Check out a branch at the last fetched origin/<branch> commit.
+
+        Args:
+            branch: Branch to check out (default: main).
 
-        # Then pull
-        returncode, stdout, stderr = await self._run_git_command("pull", "origin", branch)
+        Returns:
+            True if checkout succeeded, False otherwise.
+        """
+        # Switch to the branch and point it at the fetched commit in one step
+        returncode, stdout, stderr = await self._run_git_command(
+            "checkout", "-B", branch, f"origin/{branch}"
+        )
         if returncode != 0:
-            logger.error("Failed to pull from origin/%s: %s", branch, stderr)
+            logger.error("Failed to checkout %s at origin/%s: %s", branch, branch, stderr)
+            return False
+        return True
+
+    async def restore_main(self) -> bool:
+        """
+        Discard local changes and return to main at the last fetched commit.
+
+        Unlike pull_latest, this does no network I/O; it is meant for cleanup
+        after a workflow that already fetched main.
+
+        Returns:
+            True if the working tree was restored, False otherwise.
+        """
+        logger.info("Restoring working tree to origin/main...")
+
+        # -f discards tracked changes; -B resets main to the fetched commit
+        returncode, stdout, stderr = await self._run_git_command(
+            "checkout", "-f", "-B", "main", "origin/main"
+        )
+        if returncode != 0:
+            logger.error("Failed to checkout main at origin/main: %s", stderr)
+            return False
+
+        # Remove untracked files left by partially applied changes
+        returncode, stdout, stderr = await self._run_git_command("clean", "-fd")
+        if returncode != 0:
+            logger.error("Failed to clean working tree: %s", stderr)
             return False
 
-        logger.info("Successfully pulled latest changes from origin/%s", branch)
         return True
 
     async def create_branch(self, branch_name: str, base: str = "main") -> bool:
@@ -204,18 +405,31 @@ class GitService:
         logger.info("Successfully pushed branch '%s' to origin", branch_name)
         return True
 
-    async def get_diff(self, base: str = "main") -> str:
+    async def get_diff(self, base: str = "main", max_bytes: Optional[int] = None) -> str:
         """
         Get diff against base branch.
 
         Args:
             base: Base branch to diff against.
+            max_bytes: If set, read at most this many bytes of the diff and stop git
+                early, instead of materializing the whole patch.
 
         Returns:
             Diff output as string, or empty string on error.
         """
         logger.debug("Getting diff against %s...", base)
 
+        if max_bytes is not None:
+            return await self._get_diff_capped(base, max_bytes)
+
+        repo = self._get_repo()
+        if repo is not None:
+            try:
+                return await asyncio.to_thread(self._pygit2_diff, repo, base)
+            except Exception as e:
+                logger.error("Failed to get diff: %s", e)
+                return ""
+
         returncode, stdout, stderr = await self._run_git_command("diff", f"{base}...HEAD")
 
         if returncode != 0:
@@ -224,6 +438,74 @@ class GitService:
 
         return stdout
 
+    async def stream_diff(
+        self, base: str = "main", chunk_size: int = 64 * 1024
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream diff against base branch without buffering the whole patch.
+
+        Args:
+            base: Base branch to diff against.
+            chunk_size: Maximum bytes per yielded chunk.
+
+        Yields:
+            Raw diff output chunks. Nothing further is yielded on error.
+        """
+        logger.debug("Streaming diff against %s...", base)
+
+        process = await asyncio.create_subprocess_exec(
+            "git",
+            "diff",
+            f"{base}...HEAD",
+            cwd=self.repo_path,
+            env=await self._git_env(),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            while chunk := await process.stdout.read(chunk_size):
+                yield chunk
+
+            stderr_bytes = await process.stderr.read()
+            if await process.wait() != 0:
+                logger.error(
+                    "Failed to get diff: %s", stderr_bytes.decode("utf-8", errors="replace")
+                )
+        finally:
+            # Consumer stopped early (or was cancelled): don't leave git running
+            if process.returncode is None:
+                # os.kill rather than process.kill(): Popen.send_signal() polls first,
+                # which can reap the child behind asyncio's child watcher
+                try:
+                    os.kill(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                await process.wait()
+
+    async def _get_diff_capped(self, base: str, max_bytes: int) -> str:
+        """Read the first max_bytes of the diff from stream_diff."""
+        chunks: list[bytes] = []
+        total = 0
+        stream = self.stream_diff(base)
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= max_bytes:
+                    break
+        finally:
+            await stream.aclose()
+
+        # A multi-byte character cut at the cap decodes as a replacement char
+        return b"".join(chunks)[:max_bytes].decode("utf-8", errors="replace")
+
+    @staticmethod
+    def _pygit2_diff(repo: Any, base: str) -> str:
+        """Equivalent of `git diff base...HEAD` using pygit2."""
+        head = repo.head.peel(pygit2.Commit)
+        merge_base = repo.merge_base(repo.revparse_single(base).peel(pygit2.Commit).id, head.id)
+        return repo.diff(repo[merge_base], head).patch or ""
+
     async def get_current_branch(self) -> Optional[str]:
         """
         Get current branch name.
@@ -231,12 +513,18 @@ class GitService:
         Returns:
             Current branch name, or None on error.
         """
-        returncode, stdout, stderr = await self._run_git_command(
-            "rev-parse", "--abbrev-ref", "HEAD"
-        )
+        repo = self._get_repo()
+        if repo is not None:
+            try:
+                return "HEAD" if repo.head_is_detached else repo.head.shorthand
+            except Exception as e:
+                logger.error("Failed to get current branch: %s", e)
+                return None
+
+        returncode, stdout = await self._run_git_quick("rev-parse", "--abbrev-ref", "HEAD")
 
         if returncode != 0:
-            logger.error("Failed to get current branch: %s", stderr)
+            logger.error("Failed to get current branch (exit code %d)", returncode)
             return None
 
         return stdout.strip()
@@ -269,10 +557,18 @@ class GitService:
         Returns:
             Current commit SHA (full), or None on error.
         """
-        returncode, stdout, stderr = await self._run_git_command("rev-parse", "HEAD")
+        repo = self._get_repo()
+        if repo is not None:
+            try:
+                return str(repo.head.target)
+            except Exception as e:
+                logger.error("Failed to get current commit SHA: %s", e)
+                return None
+
+        returncode, stdout = await self._run_git_quick("rev-parse", "HEAD")
 
         if returncode != 0:
-            logger.error("Failed to get current commit SHA: %s", stderr)
+            logger.error("Failed to get current commit SHA (exit code %d)", returncode)
             return None
 
         return stdout.strip()
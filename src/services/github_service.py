@@ -1,12 +1,16 @@
 """GitHub API service with GitHub App authentication."""
 
+import asyncio
 import logging
 import time
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional
 
 import httpx
 import jwt
+from cryptography.hazmat.primitives import serialization
+
+from .lru_cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +19,15 @@ class GitHubService:
     """GitHub API interactions using GitHub App authentication."""
 
     GITHUB_API_BASE = "https://api.github.com"
+    # Throttle locally until the reset time once remaining calls drop below this
+    RATE_LIMIT_LOW_WATER = 10
+    # Conditional-GET responses kept in memory (least recently used evicted)
+    ETAG_CACHE_MAX_ENTRIES = 256
+    # Sent with every request via the shared client's default headers
+    _BASE_HEADERS = {
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
 
     def __init__(self, app_id: str, private_key: str, installation_id: str):
         """
@@ -29,21 +42,47 @@ class GitHubService:
         self.private_key = private_key
         self.installation_id = installation_id
         self._token_cache: Optional[tuple[str, datetime]] = None
+        self._jwt_cache: Optional[tuple[str, int]] = None
+        # URL -> (ETag, parsed body) for conditional GETs; 304s don't count against the rate limit
+        self._etag_cache: LRUCache[str, tuple[str, Any]] = LRUCache(self.ETAG_CACHE_MAX_ENTRIES)
+        # Parse the PEM once; PyJWT would otherwise re-parse it on every signature
+        self._signing_key = serialization.load_pem_private_key(
+            private_key.encode("utf-8"), password=None
+        )
+        # Last seen X-RateLimit-Remaining / X-RateLimit-Reset (epoch seconds)
+        self._rate_remaining: Optional[int] = None
+        self._rate_reset = 0.0
+        # Caps in-flight API calls so fan-out callers can't burst past the rate limit
+        self._api_sem = asyncio.Semaphore(8)
+        # Shared client so connections are kept alive across API calls
+        self._client = httpx.AsyncClient(
+            base_url=self.GITHUB_API_BASE,
+            headers=self._BASE_HEADERS,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_keepalive_connections=10),
+        )
         logger.debug("GitHubService initialized for app_id=%s, installation_id=%s", app_id, installation_id)
 
-    def _generate_jwt(self) -> str:
+    async def _generate_jwt(self) -> str:
         """
         Generate JWT for GitHub App authentication.
 
+        The signed JWT is cached and reused until it is within a minute of expiry.
+
         Returns:
             Signed JWT token.
 
         Raises:
             Exception: If JWT generation fails.
         """
-        # JWT expires in 10 minutes (GitHub's max is 10 minutes)
         now = int(time.time())
-        expiry = now + (10 * 60)  # 10 minutes
+        if self._jwt_cache:
+            token, expiry = self._jwt_cache
+            if expiry - now > 60:
+                return token
+
+        # JWT expires in 9 minutes (GitHub's max is 10 minutes, leave room for clock drift)
+        expiry = now + (9 * 60)
 
         payload = {
             "iat": now,  # Issued at
@@ -52,9 +91,12 @@ class GitHubService:
         }
 
         try:
-            # Sign with RS256 algorithm using private key
-            token = jwt.encode(payload, self.private_key, algorithm="RS256")
-            logger.debug("Generated GitHub App JWT (expires in 10 minutes)")
+            # Sign with RS256 using the pre-parsed key, off the event loop (RSA is CPU-bound)
+            token = await asyncio.to_thread(
+                jwt.encode, payload, self._signing_key, algorithm="RS256"
+            )
+            self._jwt_cache = (token, expiry)
+            logger.debug("Generated GitHub App JWT (expires in 9 minutes)")
             return token
         except Exception as e:
             logger.error("Failed to generate JWT: %s", e)
@@ -79,37 +121,175 @@ class GitHubService:
 
         logger.debug("Fetching new installation access token...")
 
-        # Generate JWT for authentication
-        jwt_token = self._generate_jwt()
-
         # Exchange JWT for installation token
-        url = f"{self.GITHUB_API_BASE}/app/installations/{self.installation_id}/access_tokens"
-        headers = {
-            "Authorization": f"Bearer {jwt_token}",
-            "Accept": "application/vnd.github+json",
-            "X-GitHub-Api-Version": "2022-11-28",
-        }
+        url = f"/app/installations/{self.installation_id}/access_tokens"
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(url, headers=headers)
-                response.raise_for_status()
-                data = response.json()
+        try:
+            response = await self._request("POST", url, auth=self._jwt_headers)
+            response.raise_for_status()
+            data = response.json()
 
-                token = data["token"]
-                # Cache for 50 minutes (tokens expire in 1 hour, refresh early)
-                expiry = datetime.now() + timedelta(minutes=50)
-                self._token_cache = (token, expiry)
+            token = data["token"]
+            # Cache for 50 minutes (tokens expire in 1 hour, refresh early)
+            expiry = datetime.now() + timedelta(minutes=50)
+            self._token_cache = (token, expiry)
 
-                logger.info("Fetched new installation access token (valid for 50 minutes)")
-                return token
+            logger.info("Fetched new installation access token (valid for 50 minutes)")
+            return token
+
+        except httpx.HTTPStatusError as e:
+            logger.error("Failed to fetch installation token (HTTP %d): %s", e.response.status_code, e.response.text)
+            raise
+        except Exception as e:
+            logger.error("Failed to fetch installation token: %s", e)
+            raise
+
+    async def get_installation_token(self) -> str:
+        """
+        Get an installation access token for authenticating git over HTTPS.
+
+        Returns:
+            Installation access token.
+        """
+        return await self._get_installation_token()
+
+    async def _auth_headers(self) -> dict[str, str]:
+        """
+        Build the per-request Authorization header.
+
+        Returns:
+            Headers dict with the installation token.
+        """
+        return {"Authorization": f"Bearer {await self._get_installation_token()}"}
+
+    async def _jwt_headers(self) -> dict[str, str]:
+        """
+        Build the Authorization header for App-level (JWT) requests.
+
+        Returns:
+            Headers dict with the App JWT.
+        """
+        return {"Authorization": f"Bearer {await self._generate_jwt()}"}
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict[str, str]] = None,
+        auth: Optional[Callable[[], Awaitable[dict[str, str]]]] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request through the shared client, bounded by the API semaphore.
+
+        A rate-limited request is retried once. The wait happens outside the
+        semaphore so other calls aren't blocked, and the Authorization header is
+        rebuilt for the retry in case the token expired meanwhile.
+
+        Args:
+            method: HTTP method.
+            url: API path relative to the base URL.
+            headers: Extra request headers.
+            auth: Builds the Authorization header (default: installation token).
+            **kwargs: Passed through to httpx.AsyncClient.request.
+
+        Returns:
+            The HTTP response.
+        """
+        auth = auth or self._auth_headers
+        for attempt in range(2):
+            await self._wait_for_rate_limit()
+            # Built before taking the semaphore: fetching a token is itself a request
+            request_headers = {**(headers or {}), **(await auth())}
+            async with self._api_sem:
+                response = await self._client.request(
+                    method, url, headers=request_headers, **kwargs
+                )
+            self._check_rate(response)
+
+            if attempt or not self._is_rate_limited(response):
+                return response
+
+            retry_after = response.headers.get("Retry-After")
+            delay = float(retry_after) if retry_after else self._rate_reset - time.time()
+            logger.warning(
+                "GitHub rate limit hit (HTTP %d), retrying in %.0fs",
+                response.status_code,
+                max(0.0, delay),
+            )
+            await asyncio.sleep(max(0.0, delay))
+
+        return response
+
+    def _check_rate(self, response: httpx.Response) -> None:
+        """Record the rate limit state reported by a response."""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is not None:
+            self._rate_remaining = int(remaining)
+        if reset is not None:
+            self._rate_reset = float(reset)
+
+    @staticmethod
+    def _is_rate_limited(response: httpx.Response) -> bool:
+        """Check whether a response is a primary or secondary rate limit rejection."""
+        if response.status_code not in (403, 429):
+            return False
+        return (
+            response.headers.get("X-RateLimit-Remaining") == "0"
+            or "Retry-After" in response.headers
+        )
+
+    async def _wait_for_rate_limit(self) -> None:
+        """Sleep until the rate limit resets if the remaining budget is nearly spent."""
+        if self._rate_remaining is None or self._rate_remaining >= self.RATE_LIMIT_LOW_WATER:
+            return
+
+        delay = self._rate_reset - time.time()
+        if delay > 0:
+            logger.warning(
+                "GitHub rate limit nearly exhausted (%d remaining), waiting %.0fs for reset",
+                self._rate_remaining,
+                delay,
+            )
+            await asyncio.sleep(delay)
+        self._rate_remaining = None
+
+    async def _get_json_conditional(
+        self, url: str, params: Optional[dict[str, str]] = None
+    ) -> Any:
+        """
+        GET a JSON resource, revalidating any cached copy with If-None-Match.
+
+        Args:
+            url: API path relative to the base URL.
+            params: Optional query parameters.
+
+        Returns:
+            Parsed JSON body, from the cache if GitHub answers 304 Not Modified.
+
+        Raises:
+            httpx.HTTPStatusError: If the request fails.
+        """
+        headers: dict[str, str] = {}
+        cache_key = str(httpx.URL(url, params=params))
+
+        cached = self._etag_cache.get(cache_key)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        response = await self._request("GET", url, headers=headers, params=params)
+        if response.status_code == 304 and cached:
+            logger.debug("Not modified, using cached response for %s", url)
+            return cached[1]
 
-            except httpx.HTTPStatusError as e:
-                logger.error("Failed to fetch installation token (HTTP %d): %s", e.response.status_code, e.response.text)
-                raise
-            except Exception as e:
-                logger.error("Failed to fetch installation token: %s", e)
-                raise
+        response.raise_for_status()
+        data = response.json()
+
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etag_cache.put(cache_key, (etag, data))
+        return data
 
     async def create_pull_request(
         self,
@@ -137,13 +317,7 @@ class GitHubService:
         """
         logger.info("Creating pull request: %s -> %s in %s", head_branch, base_branch, repo)
 
-        token = await self._get_installation_token()
-        url = f"{self.GITHUB_API_BASE}/repos/{repo}/pulls"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/vnd.github+json",
-            "X-GitHub-Api-Version": "2022-11-28",
-        }
+        url = f"/repos/{repo}/pulls"
 
         payload = {
             "title": title,
@@ -152,21 +326,20 @@ class GitHubService:
             "base": base_branch,
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
-                pr_data = response.json()
+        try:
+            response = await self._request("POST", url, json=payload)
+            response.raise_for_status()
+            pr_data = response.json()
 
-                logger.info("Created PR #%d: %s", pr_data["number"], pr_data["html_url"])
-                return pr_data
+            logger.info("Created PR #%d: %s", pr_data["number"], pr_data["html_url"])
+            return pr_data
 
-            except httpx.HTTPStatusError as e:
-                logger.error("Failed to create PR (HTTP %d): %s", e.response.status_code, e.response.text)
-                raise
-            except Exception as e:
-                logger.error("Failed to create PR: %s", e)
-                raise
+        except httpx.HTTPStatusError as e:
+            logger.error("Failed to create PR (HTTP %d): %s", e.response.status_code, e.response.text)
+            raise
+        except Exception as e:
+            logger.error("Failed to create PR: %s", e)
+            raise
 
     async def get_pull_request(self, repo: str, pr_number: int) -> dict[str, Any]:
         """
@@ -184,26 +357,17 @@ class GitHubService:
         """
         logger.debug("Fetching PR #%d from %s...", pr_number, repo)
 
-        token = await self._get_installation_token()
-        url = f"{self.GITHUB_API_BASE}/repos/{repo}/pulls/{pr_number}"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/vnd.github+json",
-            "X-GitHub-Api-Version": "2022-11-28",
-        }
+        url = f"/repos/{repo}/pulls/{pr_number}"
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                return response.json()
+        try:
+            return await self._get_json_conditional(url)
 
-            except httpx.HTTPStatusError as e:
-                logger.error("Failed to fetch PR (HTTP %d): %s", e.response.status_code, e.response.text)
-                raise
-            except Exception as e:
-                logger.error("Failed to fetch PR: %s", e)
-                raise
+        except httpx.HTTPStatusError as e:
+            logger.error("Failed to fetch PR (HTTP %d): %s", e.response.status_code, e.response.text)
+            raise
+        except Exception as e:
+            logger.error("Failed to fetch PR: %s", e)
+            raise
 
     async def list_repository_contents(
         self, repo: str, path: str = "", ref: str = "main"
@@ -224,27 +388,18 @@ class GitHubService:
         """
         logger.debug("Listing repository contents: %s/%s (ref=%s)", repo, path, ref)
 
-        token = await self._get_installation_token()
-        url = f"{self.GITHUB_API_BASE}/repos/{repo}/contents/{path}"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/vnd.github+json",
-            "X-GitHub-Api-Version": "2022-11-28",
-        }
+        url = f"/repos/{repo}/contents/{path}"
         params = {"ref": ref}
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, headers=headers, params=params)
-                response.raise_for_status()
-                return response.json()
+        try:
+            return await self._get_json_conditional(url, params=params)
 
-            except httpx.HTTPStatusError as e:
-                logger.error("Failed to list contents (HTTP %d): %s", e.response.status_code, e.response.text)
-                raise
-            except Exception as e:
-                logger.error("Failed to list contents: %s", e)
-                raise
+        except httpx.HTTPStatusError as e:
+            logger.error("Failed to list contents (HTTP %d): %s", e.response.status_code, e.response.text)
+            raise
+        except Exception as e:
+            logger.error("Failed to list contents: %s", e)
+            raise
 
     async def post_pr_comment(
         self,
@@ -268,28 +423,25 @@ class GitHubService:
         """
         logger.info("Posting comment on PR #%d in %s", pr_number, repo)
 
-        token = await self._get_installation_token()
-        url = f"{self.GITHUB_API_BASE}/repos/{repo}/issues/{pr_number}/comments"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/vnd.github+json",
-            "X-GitHub-Api-Version": "2022-11-28",
-        }
+        url = f"/repos/{repo}/issues/{pr_number}/comments"
 
         payload = {"body": body}
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
-                comment_data = response.json()
-
-                logger.info("Posted comment on PR #%d: comment_id=%d", pr_number, comment_data["id"])
-                return comment_data
-
-            except httpx.HTTPStatusError as e:
-                logger.error("Failed to post PR comment (HTTP %d): %s", e.response.status_code, e.response.text)
-                raise
-            except Exception as e:
-                logger.error("Failed to post PR comment: %s", e)
-                raise
+        try:
+            response = await self._request("POST", url, json=payload)
+            response.raise_for_status()
+            comment_data = response.json()
+
+            logger.info("Posted comment on PR #%d: comment_id=%d", pr_number, comment_data["id"])
+            return comment_data
+
+        except httpx.HTTPStatusError as e:
+            logger.error("Failed to post PR comment (HTTP %d): %s", e.response.status_code, e.response.text)
+            raise
+        except Exception as e:
+            logger.error("Failed to post PR comment: %s", e)
+            raise
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        await self._client.aclose()
@@ -0,0 +1,66 @@
+"""Bounded in-process LRU cache shared by the services and tools."""
+
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Sentinel distinguishing a missing key from a cached None
+_MISSING: object = object()
+
+
+class LRUCache(Generic[K, V]):
+    """Mapping that evicts its least recently used entry once full.
+
+    With a ttl, entries also expire that many seconds after they were stored;
+    expired entries are dropped when they are next looked up.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept.
+            ttl: Seconds an entry stays valid, or None to keep it until evicted.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (value, stored_at), least recently used first
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Return the value for a key and mark it recently used, or default if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        if self.ttl is not None and time.monotonic() - entry[1] >= self.ttl:
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used entry if over maxsize."""
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Remove a key and return its value, or default if missing."""
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+
+    def __contains__(self, key: object) -> bool:
+        """Check for a live entry, marking it recently used."""
+        return self.get(key, _MISSING) is not _MISSING  # type: ignore[arg-type]
+
+    def __len__(self) -> int:
+        return len(self._entries)
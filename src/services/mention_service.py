@@ -1,28 +1,49 @@
 """Service for managing processed mentions."""
 
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Optional
 
-from sqlalchemy import select
+from sqlalchemy import exists, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..orm.processed_mention import ProcessedMention
 from .database import get_db_service
+from .processed_cache import ProcessedCache
+
+# Rows soft-deleted per transaction during cleanup
+CLEANUP_BATCH_SIZE = 5_000
 
 
 class MentionService:
     """Service for managing processed mentions."""
 
+    def __init__(self):
+        # Repeat lookups of processed items skip the database; misses always query it
+        self._cache = ProcessedCache()
+
     async def is_processed(self, mention_uri: str) -> bool:
         """Check if a mention has already been processed."""
+        cached = self._cache.lookup(mention_uri)
+        if cached is not None:
+            return cached
+
         db = get_db_service()
         async with db.session() as session:
-            result = await session.execute(
-                select(ProcessedMention).where(
-                    ProcessedMention.mention_uri == mention_uri,
-                    ProcessedMention.is_deleted == False,  # noqa: E712
+            # Pure EXISTS: the database answers a boolean, no row is hydrated
+            found = await session.scalar(
+                select(
+                    exists().where(
+                        ProcessedMention.mention_uri == mention_uri,
+                        ProcessedMention.is_deleted == False,  # noqa: E712
+                    )
                 )
             )
-            return result.scalar_one_or_none() is not None
+            if not found:
+                return False
+
+        self._cache.add(mention_uri)
+        return True
 
     async def mark_processed(
         self,
@@ -32,36 +53,121 @@ class MentionService:
         mention_text: str,
         reply_uri: Optional[str] = None,
         thread_uri: Optional[str] = None,
+        session: Optional[AsyncSession] = None,
     ) -> ProcessedMention:
-        """Mark a mention as processed."""
+        """Mark a mention as processed.
+
+        If ``session`` is given the row is added to the caller's transaction and
+        committed with it; otherwise a session is opened and committed here.
+        """
+        mention = ProcessedMention(
+            mention_uri=mention_uri,
+            author_did=author_did,
+            author_handle=author_handle,
+            mention_text=mention_text,
+            reply_uri=reply_uri,
+            thread_uri=thread_uri,
+        )
+        if session is not None:
+            session.add(mention)
+            # Cached only if the caller's transaction actually commits
+            self._cache.add_on_commit(session, mention_uri)
+            return mention
+
         db = get_db_service()
         async with db.session() as session:
-            mention = ProcessedMention(
-                mention_uri=mention_uri,
-                author_did=author_did,
-                author_handle=author_handle,
-                mention_text=mention_text,
-                reply_uri=reply_uri,
-                thread_uri=thread_uri,
-            )
             session.add(mention)
             await session.commit()
-            await session.refresh(mention)
-            return mention
+
+        self._cache.add(mention_uri)
+        return mention
+
+    async def claim(
+        self,
+        mention_uri: str,
+        author_did: str,
+        author_handle: str,
+        mention_text: str,
+        reply_uri: Optional[str] = None,
+        thread_uri: Optional[str] = None,
+    ) -> bool:
+        """Atomically mark a mention as processed unless it already is.
+
+        Uses a single INSERT ... ON CONFLICT DO NOTHING, so concurrent
+        deliveries of the same mention cannot both claim it.
+
+        Returns:
+            True if this call inserted the row, False if it already existed.
+        """
+        db = get_db_service()
+        async with db.session() as session:
+            inserted_id = await session.scalar(
+                sqlite_insert(ProcessedMention)
+                .values(
+                    mention_uri=mention_uri,
+                    author_did=author_did,
+                    author_handle=author_handle,
+                    mention_text=mention_text,
+                    reply_uri=reply_uri,
+                    thread_uri=thread_uri,
+                )
+                .on_conflict_do_nothing(index_elements=["mention_uri"])
+                .returning(ProcessedMention.id)
+            )
+
+        if inserted_id is None:
+            return False
+
+        self._cache.add(mention_uri)
+        return True
+
+    async def mark_processed_many(self, mentions: list[dict[str, Any]]) -> None:
+        """Mark a batch of mentions as processed in a single transaction.
+
+        Each dict holds the keyword arguments accepted by ``mark_processed``.
+        """
+        if not mentions:
+            return
+
+        db = get_db_service()
+        async with db.session() as session:
+            await session.execute(insert(ProcessedMention), mentions)
+
+        for row in mentions:
+            self._cache.add(row["mention_uri"])
 
     async def cleanup_old_mentions(self, days: int = 30):
         """Clean up mentions older than N days (soft delete)."""
         db = get_db_service()
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
 
-        async with db.session() as session:
-            result = await session.execute(
-                select(ProcessedMention).where(
-                    ProcessedMention.created_at < cutoff,
-                    ProcessedMention.is_deleted == False,  # noqa: E712
+        # Soft delete in bounded batches so each transaction stays short. Each
+        # batch walks the live-rows partial index from the oldest entry; rows
+        # already soft-deleted drop out of that index, so it doubles as the
+        # cursor and old tombstones are never rescanned.
+        while True:
+            async with db.session() as session:
+                batch = (
+                    select(ProcessedMention.id)
+                    .where(
+                        ProcessedMention.created_at < cutoff,
+                        ProcessedMention.is_deleted == False,  # noqa: E712
+                    )
+                    .order_by(ProcessedMention.created_at)
+                    .limit(CLEANUP_BATCH_SIZE)
                 )
-            )
-            old_mentions = result.scalars().all()
-            for mention in old_mentions:
-                mention.is_deleted = True
-            await session.commit()
+                result = await session.execute(
+                    update(ProcessedMention)
+                    .where(ProcessedMention.id.in_(batch.scalar_subquery()))
+                    .values(is_deleted=True)
+                    .returning(ProcessedMention.id)
+                    .execution_options(synchronize_session=False)
+                )
+                ids = result.scalars().all()
+                await session.commit()
+
+            if len(ids) < CLEANUP_BATCH_SIZE:
+                break
+
+        # Soft-deleted IDs must no longer be reported as processed
+        self._cache.clear()
@@ -1,10 +1,14 @@
 """Service for iterative PR improvements via comment feedback."""
 
+import asyncio
 import logging
 import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import exists, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from ..config import Config
 from ..orm.pr_comment import PRComment
@@ -14,9 +18,132 @@ from .code_analysis_service import CodeAnalysisService
 from .database import DatabaseService
 from .git_service import GitService
 from .github_service import GitHubService
+from .lru_cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Seconds to reuse fetched PR metadata across back-to-back comments
+PR_CACHE_TTL = 60.0
+
+# PRs whose metadata and diff are kept in memory (least recently used evicted)
+PR_CACHE_MAX_ENTRIES = 64
+
+# Diff context budget for improvement prompts, estimated at ~4 characters per token
+MAX_DIFF_TOKENS = 1250
+CHARS_PER_TOKEN = 4
+
+# Upper bound on diff bytes read from git; well above the prompt budget so the
+# head/tail slice still has real context, but huge PRs are never fully loaded
+MAX_DIFF_BYTES = 64 * 1024
+
+# Consecutive failures of the same feedback on a PR before it is no longer retried
+MAX_FAILED_ATTEMPTS = 3
+
+# Improvement prompt pieces, filled with str.format_map
+_IMPROVEMENT_PROMPT = """This is an iterative improvement to an existing pull request.
+
+**Original Request:**
+{original_prompt}
+
+**PR Description:**
+{pr_body}
+
+**Current PR Changes (diff vs main):**
+```diff
+{truncated_diff}
+```
+
+**User Feedback:**
+{comment_body}
+"""
+
+_REVIEW_CONTEXT = """
+
+**Context: Inline Review Comment**
+File: {file_path}
+Diff hunk:
+```diff
+{diff_hunk}
+```
+"""
+
+_IMPROVEMENT_TASK = """
+
+**Your Task:**
+Generate INCREMENTAL changes that address the user's feedback while building on the existing PR changes. Do NOT rewrite the entire PR - only make targeted changes to address the specific feedback.
+
+Focus on:
+1. Understanding the feedback in context of existing changes
+2. Making minimal, targeted modifications
+3. Preserving existing functionality
+4. Ensuring changes integrate cleanly with current PR state
+"""
+
+
+class _IterationTracker:
+    """Outcome of a single PR iteration, recorded exactly once."""
+
+    def __init__(
+        self,
+        service: "PRImprovementService",
+        pr_number: int,
+        iteration_number: int,
+        comment_id: int,
+        comment_body: str,
+        start_time: float,
+    ):
+        self._service = service
+        self.pr_number = pr_number
+        self.iteration_number = iteration_number
+        self.comment_id = comment_id
+        self.comment_body = comment_body
+        self.start_time = start_time
+        self.result: Optional[tuple[bool, str]] = None
+
+    @property
+    def elapsed_ms(self) -> int:
+        """Milliseconds since processing of the comment started."""
+        return int((time.time() - self.start_time) * 1000)
+
+    async def fail(self, error_msg: str) -> tuple[bool, str]:
+        """Post an error comment (in the background) and record the failure.
+
+        Args:
+            error_msg: Error message
+
+        Returns:
+            Failure result tuple
+        """
+        self.result = (False, error_msg)
+        self._service._in_background(
+            self._service._post_error_comment(self.pr_number, error_msg)
+        )
+        await self._service._record_iteration_failure(
+            self.pr_number, self.iteration_number, self.comment_id, self.comment_body,
+            error_msg, self.start_time
+        )
+        return self.result
+
+    async def succeed(self, commit_sha: str, message: str) -> tuple[bool, str]:
+        """Post the success comment (in the background) and record the iteration.
+
+        Args:
+            commit_sha: Commit SHA
+            message: Success message
+
+        Returns:
+            Success result tuple
+        """
+        self.result = (True, message)
+        self._service._in_background(
+            self._service._post_success_comment(self.pr_number, message)
+        )
+        await self._service._record_iteration_success(
+            self.pr_number, self.iteration_number, self.comment_id, self.comment_body,
+            commit_sha, self.elapsed_ms
+        )
+        return self.result
+
 
 class PRImprovementService:
     """Process PR comment feedback and apply iterative improvements."""
@@ -43,6 +170,13 @@ class PRImprovementService:
         self.code_analysis = code_analysis_service
         self.db = db_service
         self.config = config
+        # pr_number -> pr_data, reused for PR_CACHE_TTL seconds
+        self._pr_cache: LRUCache[int, dict] = LRUCache(PR_CACHE_MAX_ENTRIES, ttl=PR_CACHE_TTL)
+        # pr_number -> (head_sha, diff); a diff is only reused for the same commit
+        self._diff_cache: LRUCache[int, tuple[str, str]] = LRUCache(PR_CACHE_MAX_ENTRIES)
+        self._worktree_lock = asyncio.Lock()
+        # PR comment posts run in the background; keep references until they finish
+        self._bg_tasks: set[asyncio.Task] = set()
         logger.debug("PRImprovementService initialized")
 
     async def process_comment(
@@ -69,6 +203,30 @@ class PRImprovementService:
         Returns:
             Tuple of (success, message)
         """
+        # Comments are handled one at a time: every PR shares one working tree,
+        # so concurrent checkouts/commits/pushes would trample each other
+        async with self._worktree_lock:
+            return await self._process_comment(
+                pr_number,
+                comment_id,
+                comment_body,
+                commenter_login,
+                is_review_comment,
+                file_path,
+                diff_hunk,
+            )
+
+    async def _process_comment(
+        self,
+        pr_number: int,
+        comment_id: int,
+        comment_body: str,
+        commenter_login: str,
+        is_review_comment: bool,
+        file_path: Optional[str],
+        diff_hunk: Optional[str],
+    ) -> tuple[bool, str]:
+        """Process PR comment while holding the working tree lock."""
         start_time = time.time()
 
         logger.info(
@@ -77,186 +235,231 @@ class PRImprovementService:
         )
 
         try:
-            # 1. Get next iteration number for this PR
-            iteration_number = await self._get_next_iteration_number(pr_number)
-
-            # 2. Mark comment as being processed
-            await self._mark_comment_processing(
-                pr_number, comment_id, comment_body, commenter_login
-            )
+            # Skip duplicate triggers and feedback that keeps failing before any real work
+            previous = await self._check_previous_attempts(pr_number, comment_id, comment_body)
+            if previous is not None:
+                return previous
+
+            # 1. Get next iteration number for this PR (the iteration records its own outcome)
+            async with self._iteration(
+                pr_number, comment_id, comment_body, start_time
+            ) as iteration:
+                iteration_number = iteration.iteration_number
+
+                # 2. Mark comment as being processed
+                await self._mark_comment_processing(
+                    pr_number, comment_id, comment_body, commenter_login
+                )
 
-            # 3. Fetch PR details
-            logger.info("Step 1/10: Fetching PR details...")
-            pr_data = await self.github.get_pull_request(
-                repo=self.config.github.repository,
-                pr_number=pr_number,
-            )
+                # 3. Fetch PR details
+                logger.info("Step 1/9: Fetching PR details...")
+                pr_data = await self._get_pull_request(pr_number)
+
+                branch_name = pr_data["head"]["ref"]
+                pr_title = pr_data["title"]
+                pr_body = pr_data["body"] or ""
+
+                logger.info(f"PR branch: {branch_name}")
+
+                # 4. Checkout PR branch at the latest remote commit (cloning on first use)
+                logger.info(f"Step 2/9: Checking out latest '{branch_name}'...")
+                success = await self.git.ensure_cached_clone(self.config.github.repository)
+                if success:
+                    success = await self.git.pull_latest(branch_name)
+                if not success:
+                    error_msg = f"Failed to pull latest changes from '{branch_name}'"
+                    logger.error(error_msg)
+                    return await iteration.fail(error_msg)
+
+                # 5. Get PR diff for context
+                logger.info("Step 3/9: Getting PR diff for context...")
+                pr_diff = await self._get_pr_diff(pr_number)
+
+                # 6. Build improvement prompt
+                logger.info("Step 4/9: Building improvement prompt...")
+                improvement_prompt = self._build_improvement_prompt(
+                    original_prompt=pr_title,
+                    pr_body=pr_body,
+                    pr_diff=pr_diff,
+                    comment_body=comment_body,
+                    is_review_comment=is_review_comment,
+                    file_path=file_path,
+                    diff_hunk=diff_hunk,
+                )
 
-            branch_name = pr_data["head"]["ref"]
-            pr_title = pr_data["title"]
-            pr_body = pr_data["body"] or ""
-
-            logger.info(f"PR branch: {branch_name}")
-
-            # 4. Checkout PR branch
-            logger.info(f"Step 2/10: Checking out PR branch '{branch_name}'...")
-            success = await self.git.checkout_branch(branch_name)
-            if not success:
-                error_msg = f"Failed to checkout branch '{branch_name}'"
-                logger.error(error_msg)
-                await self._record_iteration_failure(
-                    pr_number, iteration_number, comment_id, comment_body,
-                    error_msg, start_time
+                # 7. Analyze feedback and generate incremental changes
+                logger.info("Step 5/9: Analyzing feedback and generating changes...")
+                changes_result = await self.code_analysis.analyze_and_generate_changes(
+                    improvement_prompt, conversation_id=f"pr-{pr_number}-iteration-{iteration_number}"
                 )
-                await self._post_error_comment(pr_number, error_msg)
-                return (False, error_msg)
-
-            # 5. Pull latest changes from remote
-            logger.info("Step 3/10: Pulling latest changes...")
-            success = await self.git.pull_latest(branch_name)
-            if not success:
-                error_msg = f"Failed to pull latest changes from '{branch_name}'"
-                logger.error(error_msg)
-                await self._record_iteration_failure(
-                    pr_number, iteration_number, comment_id, comment_body,
-                    error_msg, start_time
+
+                if not changes_result["success"]:
+                    error_msg = f"Failed to generate changes: {changes_result['explanation']}"
+                    logger.error(error_msg)
+                    return await iteration.fail(error_msg)
+
+                if not changes_result["changes"]:
+                    error_msg = "No changes generated from feedback"
+                    logger.warning(error_msg)
+                    return await iteration.fail(error_msg)
+
+                # 8. Apply changes
+                logger.info(f"Step 6/9: Applying {len(changes_result['changes'])} file changes...")
+                success, error = await self.code_analysis.apply_changes(changes_result["changes"])
+                if not success:
+                    error_msg = f"Failed to apply changes: {error}"
+                    logger.error(error_msg)
+                    return await iteration.fail(error_msg)
+
+                # 9. Validate changes
+                logger.info("Step 7/9: Validating changes...")
+                valid, error = await self.code_analysis.validate_changes(changes_result["changes"])
+                if not valid:
+                    error_msg = f"Validation failed: {error}"
+                    logger.error(error_msg)
+                    return await iteration.fail(error_msg)
+
+                # 10. Commit changes
+                commit_message = changes_result.get("commit_message", f"Apply feedback: {comment_body[:60]}")
+                logger.info(f"Step 8/9: Committing changes: {commit_message}")
+                if not await self.git.commit_changes(commit_message):
+                    error_msg = "Failed to commit changes"
+                    logger.error(error_msg)
+                    return await iteration.fail(error_msg)
+
+                # 11-12. Get commit SHA and push changes (independent, run concurrently)
+                logger.info(f"Step 9/9: Pushing changes to branch '{branch_name}'...")
+                commit_sha, pushed = await asyncio.gather(
+                    self.git.get_current_commit_sha(),
+                    self.git.push_branch(branch_name),
                 )
-                await self._post_error_comment(pr_number, error_msg)
-                return (False, error_msg)
-
-            # 6. Get PR diff for context
-            logger.info("Step 4/10: Getting PR diff for context...")
-            pr_diff = await self.git.get_diff("main")
-
-            # 7. Build improvement prompt
-            logger.info("Step 5/10: Building improvement prompt...")
-            improvement_prompt = self._build_improvement_prompt(
-                original_prompt=pr_title,
-                pr_body=pr_body,
-                pr_diff=pr_diff,
-                comment_body=comment_body,
-                is_review_comment=is_review_comment,
-                file_path=file_path,
-                diff_hunk=diff_hunk,
-            )
+                if not pushed:
+                    error_msg = f"Failed to push branch '{branch_name}'"
+                    logger.error(error_msg)
+                    return await iteration.fail(error_msg)
 
-            # 8. Analyze feedback and generate incremental changes
-            logger.info("Step 6/10: Analyzing feedback and generating changes...")
-            changes_result = await self.code_analysis.analyze_and_generate_changes(
-                improvement_prompt, conversation_id=f"pr-{pr_number}-iteration-{iteration_number}"
-            )
+                # Our push moved the PR head; don't serve stale metadata
+                self._pr_cache.pop(pr_number, None)
 
-            if not changes_result["success"]:
-                error_msg = f"Failed to generate changes: {changes_result['explanation']}"
-                logger.error(error_msg)
-                await self._record_iteration_failure(
-                    pr_number, iteration_number, comment_id, comment_body,
-                    error_msg, start_time
-                )
-                await self._post_error_comment(pr_number, error_msg)
-                return (False, error_msg)
-
-            if not changes_result["changes"]:
-                error_msg = "No changes generated from feedback"
-                logger.warning(error_msg)
-                await self._record_iteration_failure(
-                    pr_number, iteration_number, comment_id, comment_body,
-                    error_msg, start_time
-                )
-                await self._post_error_comment(pr_number, error_msg)
-                return (False, error_msg)
-
-            # 9. Apply changes
-            logger.info(f"Step 7/10: Applying {len(changes_result['changes'])} file changes...")
-            success, error = await self.code_analysis.apply_changes(changes_result["changes"])
-            if not success:
-                error_msg = f"Failed to apply changes: {error}"
-                logger.error(error_msg)
-                await self._record_iteration_failure(
-                    pr_number, iteration_number, comment_id, comment_body,
-                    error_msg, start_time
+                # 13-14. Post success comment (in the background) and record successful iteration
+                success_message = self._build_success_message(
+                    iteration_number, commit_message, commit_sha, changes_result
                 )
-                await self._post_error_comment(pr_number, error_msg)
-                return (False, error_msg)
-
-            # 10. Validate changes
-            logger.info("Step 8/10: Validating changes...")
-            valid, error = await self.code_analysis.validate_changes()
-            if not valid:
-                error_msg = f"Validation failed: {error}"
-                logger.error(error_msg)
-                await self._record_iteration_failure(
-                    pr_number, iteration_number, comment_id, comment_body,
-                    error_msg, start_time
-                )
-                await self._post_error_comment(pr_number, error_msg)
-                return (False, error_msg)
-
-            # 11. Commit changes
-            commit_message = changes_result.get("commit_message", f"Apply feedback: {comment_body[:60]}")
-            logger.info(f"Step 9/10: Committing changes: {commit_message}")
-            if not await self.git.commit_changes(commit_message):
-                error_msg = "Failed to commit changes"
-                logger.error(error_msg)
-                await self._record_iteration_failure(
-                    pr_number, iteration_number, comment_id, comment_body,
-                    error_msg, start_time
-                )
-                await self._post_error_comment(pr_number, error_msg)
-                return (False, error_msg)
-
-            # 12. Get commit SHA
-            commit_sha = await self.git.get_current_commit_sha()
-
-            # 13. Push changes
-            logger.info(f"Step 10/10: Pushing changes to branch '{branch_name}'...")
-            if not await self.git.push_branch(branch_name):
-                error_msg = f"Failed to push branch '{branch_name}'"
-                logger.error(error_msg)
-                await self._record_iteration_failure(
-                    pr_number, iteration_number, comment_id, comment_body,
-                    error_msg, start_time
+                result = await iteration.succeed(commit_sha, success_message)
+
+                logger.info(
+                    f"PR improvement complete: pr={pr_number}, iteration={iteration_number}, "
+                    f"commit={commit_sha[:8]}, time={iteration.elapsed_ms}ms"
                 )
-                await self._post_error_comment(pr_number, error_msg)
-                return (False, error_msg)
-
-            # 14. Record successful iteration
-            execution_time_ms = int((time.time() - start_time) * 1000)
-            await self._record_iteration_success(
-                pr_number, iteration_number, comment_id, comment_body,
-                commit_sha, execution_time_ms
-            )
 
-            # 15. Post success comment
-            success_message = self._build_success_message(
-                iteration_number, commit_message, commit_sha, changes_result
-            )
-            await self._post_success_comment(pr_number, success_message)
+                return result
 
-            logger.info(
-                f"PR improvement complete: pr={pr_number}, iteration={iteration_number}, "
-                f"commit={commit_sha[:8]}, time={execution_time_ms}ms"
-            )
+            # Reached only when an error inside the iteration was recorded and suppressed
+            return iteration.result
 
-            return (True, success_message)
+        except Exception as e:
+            error_msg = f"Unexpected error processing PR comment: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            self._in_background(self._post_error_comment(pr_number, error_msg))
+            return (False, error_msg)
+
+    @asynccontextmanager
+    async def _iteration(
+        self,
+        pr_number: int,
+        comment_id: int,
+        comment_body: str,
+        start_time: float,
+    ) -> AsyncIterator[_IterationTracker]:
+        """Allocate the next iteration and make sure its outcome is recorded.
+
+        Errors raised inside the block are recorded as failures and suppressed;
+        a block that finishes without calling fail() or succeed() is recorded
+        as an unknown error.
+
+        Args:
+            pr_number: GitHub PR number
+            comment_id: GitHub comment ID
+            comment_body: Comment text
+            start_time: Start time (for calculating execution time)
+
+        Yields:
+            Tracker for reporting the iteration's outcome
+        """
+        iteration_number = await self._get_next_iteration_number(pr_number)
+        iteration = _IterationTracker(
+            self, pr_number, iteration_number, comment_id, comment_body, start_time
+        )
 
+        try:
+            yield iteration
         except Exception as e:
             error_msg = f"Unexpected error processing PR comment: {str(e)}"
             logger.error(error_msg, exc_info=True)
+            if iteration.result is None:
+                try:
+                    await iteration.fail(error_msg)
+                except Exception:
+                    pass  # Best effort
+        else:
+            if iteration.result is None:
+                await iteration.fail("Unknown error")
+
+    def _in_background(self, coro) -> None:
+        """Run a coroutine without waiting for it (used for GitHub comment posts).
 
-            # Try to record failure
-            try:
-                execution_time_ms = int((time.time() - start_time) * 1000)
-                iteration_number = await self._get_next_iteration_number(pr_number)
-                await self._record_iteration_failure(
-                    pr_number, iteration_number - 1 if iteration_number > 1 else 1,
-                    comment_id, comment_body, error_msg, start_time
-                )
-                await self._post_error_comment(pr_number, error_msg)
-            except Exception:
-                pass  # Best effort
+        Args:
+            coro: Coroutine that handles and logs its own errors
+        """
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
 
-            return (False, error_msg)
+    async def close(self) -> None:
+        """Wait for background comment posts to finish."""
+        if self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks)
+
+    async def _get_pull_request(self, pr_number: int) -> dict:
+        """Fetch PR details, reusing a recent fetch for the same PR.
+
+        Args:
+            pr_number: GitHub PR number
+
+        Returns:
+            PR data dict
+        """
+        cached = self._pr_cache.get(pr_number)
+        if cached is not None:
+            logger.debug("Using cached details for PR #%d", pr_number)
+            return cached
+
+        pr_data = await self.github.get_pull_request(
+            repo=self.config.github.repository,
+            pr_number=pr_number,
+        )
+        self._pr_cache.put(pr_number, pr_data)
+        return pr_data
+
+    async def _get_pr_diff(self, pr_number: int) -> str:
+        """Get the PR diff against main, reusing it while HEAD is unchanged.
+
+        Args:
+            pr_number: GitHub PR number
+
+        Returns:
+            Diff of the checked-out PR branch against main
+        """
+        head_sha = await self.git.get_current_commit_sha()
+        cached = self._diff_cache.get(pr_number)
+        if head_sha and cached and cached[0] == head_sha:
+            logger.debug("Using cached diff for PR #%d at %s", pr_number, head_sha[:8])
+            return cached[1]
+
+        pr_diff = await self.git.get_diff("main", max_bytes=MAX_DIFF_BYTES)
+        if head_sha:
+            self._diff_cache.put(pr_number, (head_sha, pr_diff))
+        return pr_diff
 
     def _build_improvement_prompt(
         self,
@@ -282,53 +485,31 @@ class PRImprovementService:
         Returns:
             Improvement prompt for Claude
         """
-        # Truncate diff if too long (keep first 5000 chars)
-        max_diff_length = 5000
-        truncated_diff = pr_diff[:max_diff_length]
-        if len(pr_diff) > max_diff_length:
-            truncated_diff += "\n... (diff truncated)"
-
-        prompt = f"""This is an iterative improvement to an existing pull request.
-
-**Original Request:**
-{original_prompt}
-
-**PR Description:**
-{pr_body}
-
-**Current PR Changes (diff vs main):**
-```diff
-{truncated_diff}
-```
-
-**User Feedback:**
-{comment_body}
-"""
-
+        # Keep the head and tail of long diffs: the end often holds the latest files
+        max_diff_chars = MAX_DIFF_TOKENS * CHARS_PER_TOKEN
+        if len(pr_diff) > max_diff_chars:
+            head_chars = max_diff_chars * 7 // 10
+            tail_chars = max_diff_chars - head_chars
+            truncated_diff = (
+                f"{pr_diff[:head_chars]}\n... (diff truncated)\n{pr_diff[-tail_chars:]}"
+            )
+        else:
+            truncated_diff = pr_diff
+
+        ctx = {
+            "original_prompt": original_prompt,
+            "pr_body": pr_body,
+            "truncated_diff": truncated_diff,
+            "comment_body": comment_body,
+            "file_path": file_path,
+            "diff_hunk": diff_hunk,
+        }
+        parts = [_IMPROVEMENT_PROMPT.format_map(ctx)]
         if is_review_comment and file_path and diff_hunk:
-            prompt += f"""
-
-**Context: Inline Review Comment**
-File: {file_path}
-Diff hunk:
-```diff
-{diff_hunk}
-```
-"""
-
-        prompt += """
+            parts.append(_REVIEW_CONTEXT.format_map(ctx))
+        parts.append(_IMPROVEMENT_TASK)
 
-**Your Task:**
-Generate INCREMENTAL changes that address the user's feedback while building on the existing PR changes. Do NOT rewrite the entire PR - only make targeted changes to address the specific feedback.
-
-Focus on:
-1. Understanding the feedback in context of existing changes
-2. Making minimal, targeted modifications
-3. Preserving existing functionality
-4. Ensuring changes integrate cleanly with current PR state
-"""
-
-        return prompt
+        return "".join(parts)
 
     def _build_success_message(
         self,
@@ -360,6 +541,55 @@ Focus on:
 """
         return message
 
+    async def _check_previous_attempts(
+        self, pr_number: int, comment_id: int, comment_body: str
+    ) -> Optional[tuple[bool, str]]:
+        """Check whether a comment should be skipped based on earlier iterations.
+
+        Args:
+            pr_number: GitHub PR number
+            comment_id: GitHub comment ID
+            comment_body: Comment text
+
+        Returns:
+            Result tuple to return early with, or None to process the comment
+        """
+        async with self.db.session() as session:
+            already_applied = await session.scalar(
+                select(
+                    exists().where(
+                        PRIteration.comment_id == comment_id,
+                        PRIteration.success == True,  # noqa: E712
+                    )
+                )
+            )
+            if already_applied:
+                logger.info(f"Comment {comment_id} already applied to PR #{pr_number}, skipping")
+                return (True, "Already processed")
+
+            recent = (
+                await session.scalars(
+                    select(PRIteration.success)
+                    .where(
+                        PRIteration.pr_number == pr_number,
+                        PRIteration.comment_body == comment_body,
+                    )
+                    .order_by(PRIteration.iteration_number.desc())
+                    .limit(MAX_FAILED_ATTEMPTS)
+                )
+            ).all()
+
+        if len(recent) == MAX_FAILED_ATTEMPTS and not any(recent):
+            error_msg = (
+                f"This feedback has failed {MAX_FAILED_ATTEMPTS} times in a row; "
+                "please rephrase or add more detail before trying again"
+            )
+            logger.warning(f"Skipping persistently failing feedback on PR #{pr_number}")
+            self._in_background(self._post_error_comment(pr_number, error_msg))
+            return (False, error_msg)
+
+        return None
+
     async def _get_next_iteration_number(self, pr_number: int) -> int:
         """Get next iteration number for PR.
 
@@ -370,14 +600,11 @@ Focus on:
             Next iteration number (1, 2, 3, ...)
         """
         async with self.db.session() as session:
-            result = await session.execute(
-                select(PRIteration.iteration_number)
-                .where(PRIteration.pr_number == pr_number)
-                .order_by(PRIteration.iteration_number.desc())
-                .limit(1)
+            return await session.scalar(
+                select(func.coalesce(func.max(PRIteration.iteration_number), 0) + 1).where(
+                    PRIteration.pr_number == pr_number
+                )
             )
-            last_iteration = result.scalar_one_or_none()
-            return (last_iteration or 0) + 1
 
     async def _mark_comment_processing(
         self,
@@ -394,25 +621,18 @@ Focus on:
             comment_body: Comment text
             commenter_login: GitHub login
         """
-        async with self.db.session() as session:
-            # Check if already exists
-            result = await session.execute(
-                select(PRComment).where(PRComment.comment_id == comment_id)
-            )
-            existing = result.scalar_one_or_none()
-
-            if existing:
-                existing.processed = True
-            else:
-                # Get selfimprovement_request_id if exists
-                si_result = await session.execute(
-                    select(SelfImprovementRequest.id).where(
-                        SelfImprovementRequest.pr_number == pr_number
-                    )
-                )
-                si_request_id = si_result.scalar_one_or_none()
+        # Link to the originating self-improvement request, if any
+        si_request_id = (
+            select(SelfImprovementRequest.id)
+            .where(SelfImprovementRequest.pr_number == pr_number)
+            .limit(1)
+            .scalar_subquery()
+        )
 
-                comment = PRComment(
+        async with self.db.session() as session:
+            await session.execute(
+                sqlite_insert(PRComment)
+                .values(
                     pr_number=pr_number,
                     comment_id=comment_id,
                     comment_body=comment_body,
@@ -420,7 +640,11 @@ Focus on:
                     processed=True,
                     selfimprovement_request_id=si_request_id,
                 )
-                session.add(comment)
+                .on_conflict_do_update(
+                    index_elements=["comment_id"],
+                    set_={"processed": True},
+                )
+            )
 
     async def _record_iteration_success(
         self,
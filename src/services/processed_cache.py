@@ -0,0 +1,46 @@
+"""In-process cache for processed DM/mention lookups."""
+
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .lru_cache import LRUCache
+
+
+class ProcessedCache(LRUCache[str, None]):
+    """LRU of recently processed IDs.
+
+    Only positives are cached: ``lookup`` answers True when the ID is known to
+    be processed and None when the database must be asked. A miss is never
+    trusted, since another process (polling and webhook side by side, or a
+    second instance) may have processed the item since.
+    """
+
+    def __init__(self, maxsize: int = 50_000):
+        super().__init__(maxsize)
+
+    def lookup(self, key: str) -> Optional[bool]:
+        """Check the cache without touching the database."""
+        return True if key in self else None
+
+    def add(self, key: str) -> None:
+        """Record an ID as processed."""
+        self.put(key, None)
+
+    def add_on_commit(self, session: AsyncSession, key: str) -> None:
+        """Record an ID as processed once the caller's transaction commits.
+
+        If the transaction rolls back first, the ID is never cached.
+        """
+        pending = [key]
+
+        def on_commit(_session) -> None:
+            if pending:
+                self.add(pending.pop())
+
+        def on_rollback(_session) -> None:
+            pending.clear()
+
+        event.listen(session.sync_session, "after_commit", on_commit, once=True)
+        event.listen(session.sync_session, "after_rollback", on_rollback, once=True)
@@ -1,77 +1,204 @@
 """Service for managing rate limits."""
 
+import asyncio
+import time
+from collections import defaultdict, deque
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import select, update
 
 from ..orm.rate_limit import RateLimitEvent
-from .database import get_db_service
+from .batch_writer import BatchInsertWriter
+from .database import DatabaseService
+
+# Length of the sliding rate limit window, in seconds
+WINDOW_SECONDS = 3600
+
+# Rows soft-deleted per transaction during cleanup
+CLEANUP_BATCH_SIZE = 5_000
 
 
 class RateLimitService:
-    """Service for managing rate limits."""
+    """Service for managing rate limits.
 
-    def __init__(self, max_per_hour: int):
+    Checks are answered from an in-memory sliding window of request times per
+    user. The window is loaded from the database once, so limits survive a
+    restart; events are still persisted, but in the background.
+    """
+
+    def __init__(self, max_per_hour: int, db_service: DatabaseService):
         self.max_per_hour = max_per_hour
+        self._db = db_service
+        self._windows: defaultdict[str, deque[float]] = defaultdict(deque)
+        # Slots taken by try_consume but not yet settled: mention_uri -> (user_did, time)
+        self._reserved: dict[str, tuple[str, float]] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        # Events are persisted in batches off the request path
+        self._writer = BatchInsertWriter(
+            RateLimitEvent, flush_interval=0.1, db_service=db_service
+        )
+
+    async def _load_windows(self) -> None:
+        """Load the last hour of events from the database (once)."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=WINDOW_SECONDS)
+            async with self._db.session() as session:
+                result = await session.execute(
+                    select(RateLimitEvent.user_did, RateLimitEvent.event_timestamp)
+                    .where(
+                        RateLimitEvent.event_timestamp > cutoff,
+                        RateLimitEvent.is_deleted == False,  # noqa: E712
+                    )
+                    .order_by(RateLimitEvent.event_timestamp)
+                )
+                for user_did, event_timestamp in result:
+                    # SQLite hands back naive datetimes; they are stored as UTC
+                    if event_timestamp.tzinfo is None:
+                        event_timestamp = event_timestamp.replace(tzinfo=timezone.utc)
+                    self._windows[user_did].append(event_timestamp.timestamp())
+            self._loaded = True
+
+    async def _count(self, user_did: str) -> int:
+        """Count a user's requests within the window, dropping expired ones."""
+        if not self._loaded:
+            await self._load_windows()
+        return self._prune(user_did, time.time() - WINDOW_SECONDS)
+
+    def _prune(self, user_did: str, cutoff: float) -> int:
+        """Drop a user's requests at or before cutoff; forget users with none left."""
+        window = self._windows.get(user_did)
+        if window is None:
+            return 0
+        while window and window[0] <= cutoff:
+            window.popleft()
+        if not window:
+            del self._windows[user_did]
+        return len(window)
 
     async def is_allowed(self, user_did: str) -> bool:
         """Check if a user is within rate limits."""
-        db = get_db_service()
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=1)
-
-        async with db.session() as session:
-            result = await session.execute(
-                select(func.count(RateLimitEvent.id)).where(
-                    RateLimitEvent.user_did == user_did,
-                    RateLimitEvent.event_timestamp > cutoff,
-                    RateLimitEvent.is_deleted == False,  # noqa: E712
-                )
-            )
-            count = result.scalar_one()
-            return count < self.max_per_hour
+        return await self._count(user_did) < self.max_per_hour
 
     async def record_request(self, user_did: str, mention_uri: Optional[str] = None):
-        """Record a rate limit event."""
-        db = get_db_service()
-        async with db.session() as session:
-            event = RateLimitEvent(
-                user_did=user_did,
-                event_timestamp=datetime.now(timezone.utc),
-                mention_uri=mention_uri,
-            )
-            session.add(event)
-            await session.commit()
+        """Record a rate limit event.
+
+        The in-memory window is updated immediately; the database insert is
+        batched in the background.
+        """
+        await self._count(user_did)
+        self._record(self._windows[user_did], user_did, mention_uri)
+
+    async def try_consume(self, user_did: str, mention_uri: Optional[str] = None) -> bool:
+        """Check the rate limit and reserve a slot in one step.
+
+        The check and the update happen without yielding to the event loop, so
+        concurrent requests from the same user cannot both take the last slot.
+        With a mention_uri the slot is only reserved: call settle() once the
+        item is done, so a failed reply gives the slot back. A mention_uri that
+        already holds a reservation is not charged again.
+
+        Returns:
+            True if the request is allowed, False if rate limited.
+        """
+        if mention_uri is not None and mention_uri in self._reserved:
+            return True
+
+        if await self._count(user_did) >= self.max_per_hour:
+            return False
+
+        now = time.time()
+        self._windows[user_did].append(now)
+        if mention_uri is None:
+            self._persist(user_did, now, None)
+        else:
+            self._reserved[mention_uri] = (user_did, now)
+        return True
+
+    def settle(self, mention_uri: str, consumed: bool) -> None:
+        """Settle a slot reserved by try_consume.
+
+        Args:
+            mention_uri: The URI the slot was reserved for.
+            consumed: True if the request was served (the slot is recorded),
+                False if it failed (the slot is returned to the user).
+        """
+        reservation = self._reserved.pop(mention_uri, None)
+        if reservation is None:
+            return
+
+        user_did, reserved_at = reservation
+        if consumed:
+            self._persist(user_did, reserved_at, mention_uri)
+            return
+
+        window = self._windows.get(user_did)
+        if window is not None:
+            try:
+                window.remove(reserved_at)
+            except ValueError:
+                pass  # Already expired out of the window
+            if not window:
+                del self._windows[user_did]
+
+    def _record(self, window: deque[float], user_did: str, mention_uri: Optional[str]) -> None:
+        """Add a request to a user's window and queue it for persistence."""
+        now = time.time()
+        window.append(now)
+        self._persist(user_did, now, mention_uri)
+
+    def _persist(self, user_did: str, timestamp: float, mention_uri: Optional[str]) -> None:
+        """Queue a rate limit event for insertion."""
+        self._writer.submit(
+            {
+                "user_did": user_did,
+                "event_timestamp": datetime.fromtimestamp(timestamp, timezone.utc),
+                "mention_uri": mention_uri,
+            }
+        )
 
     async def get_remaining(self, user_did: str) -> int:
         """Get remaining requests for a user."""
-        db = get_db_service()
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=1)
-
-        async with db.session() as session:
-            result = await session.execute(
-                select(func.count(RateLimitEvent.id)).where(
-                    RateLimitEvent.user_did == user_did,
-                    RateLimitEvent.event_timestamp > cutoff,
-                    RateLimitEvent.is_deleted == False,  # noqa: E712
-                )
-            )
-            count = result.scalar_one()
-            return max(0, self.max_per_hour - count)
+        return max(0, self.max_per_hour - await self._count(user_did))
+
+    async def close(self) -> None:
+        """Flush queued event inserts."""
+        await self._writer.close()
 
     async def cleanup_old_events(self, days: int = 7):
         """Clean up rate limit events older than N days."""
-        db = get_db_service()
+        # Forget users whose requests have all left the window
+        window_cutoff = time.time() - WINDOW_SECONDS
+        for user_did in list(self._windows):
+            self._prune(user_did, window_cutoff)
+
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
 
-        async with db.session() as session:
-            result = await session.execute(
-                select(RateLimitEvent).where(
-                    RateLimitEvent.event_timestamp < cutoff,
-                    RateLimitEvent.is_deleted == False,  # noqa: E712
+        # Soft delete in bounded batches, oldest first, via the live-rows index
+        while True:
+            async with self._db.session() as session:
+                batch = (
+                    select(RateLimitEvent.id)
+                    .where(
+                        RateLimitEvent.event_timestamp < cutoff,
+                        RateLimitEvent.is_deleted == False,  # noqa: E712
+                    )
+                    .order_by(RateLimitEvent.event_timestamp)
+                    .limit(CLEANUP_BATCH_SIZE)
+                )
+                result = await session.execute(
+                    update(RateLimitEvent)
+                    .where(RateLimitEvent.id.in_(batch.scalar_subquery()))
+                    .values(is_deleted=True)
+                    .returning(RateLimitEvent.id)
+                    .execution_options(synchronize_session=False)
                 )
-            )
-            old_events = result.scalars().all()
-            for event in old_events:
-                event.is_deleted = True
-            await session.commit()
+                ids = result.scalars().all()
+                await session.commit()
+
+            if len(ids) < CLEANUP_BATCH_SIZE:
+                break
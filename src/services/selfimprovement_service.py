@@ -1,5 +1,6 @@
 """Self-improvement orchestration service."""
 
+import asyncio
 import logging
 import time
 from typing import Any
@@ -11,6 +12,9 @@ from .github_service import GitHubService
 
 logger = logging.getLogger(__name__)
 
+# Bytes of the change diff included in debug logs
+DIFF_LOG_BYTES = 1000
+
 
 class SelfImprovementService:
     """Orchestrate self-improvement workflow."""
@@ -35,6 +39,9 @@ class SelfImprovementService:
         self.github = github_service
         self.code_analysis = code_analysis_service
         self.config = config
+        # Resolved once; the config does not change while the bot runs
+        self._owner_did = config.bluesky.owner_did
+        self._github_repo = config.github.repository if config.github else None
         logger.debug("SelfImprovementService initialized")
 
     async def execute_selfimprovement(
@@ -65,36 +72,45 @@ class SelfImprovementService:
 
         try:
             # 1. Verify requester is owner
-            if requester_did != self.config.bluesky.owner_did:
+            if requester_did != self._owner_did:
                 error_msg = "Unauthorized: Only bot owner can use /selfimprovement"
                 logger.warning("Unauthorized self-improvement request from %s", requester_did)
                 metadata["error"] = error_msg
                 return (False, error_msg, metadata)
 
             # 2. Verify GitHub configured
-            if not self.config.github:
+            if self._github_repo is None:
                 error_msg = "GitHub not configured. Please configure GitHub App credentials."
                 logger.error(error_msg)
                 metadata["error"] = error_msg
                 return (False, error_msg, metadata)
 
-            # 3. Pull latest code
+            # 3-4. Fetch main while checking the working directory is clean (the
+            # fetch only updates refs, so the two are independent)
             logger.info("Step 1/10: Pulling latest code from main...")
-            success = await self.git.pull_latest("main")
-            if not success:
+            logger.info("Step 2/10: Checking working directory is clean...")
+            fetched, clean = await asyncio.gather(
+                self.git.fetch_branch("main"),
+                self.git.ensure_clean_state(),
+            )
+            if not fetched:
                 error_msg = "Failed to pull latest code from main branch"
                 logger.error(error_msg)
                 metadata["error"] = error_msg
                 return (False, error_msg, metadata)
 
-            # 4. Ensure clean state
-            logger.info("Step 2/10: Checking working directory is clean...")
-            if not await self.git.ensure_clean_state():
+            if not clean:
                 error_msg = "Working directory is not clean. Please commit or stash changes."
                 logger.error(error_msg)
                 metadata["error"] = error_msg
                 return (False, error_msg, metadata)
 
+            if not await self.git.checkout_remote_branch("main"):
+                error_msg = "Failed to pull latest code from main branch"
+                logger.error(error_msg)
+                metadata["error"] = error_msg
+                return (False, error_msg, metadata)
+
             # 5. Generate changes with Claude
             logger.info("Step 3/10: Analyzing prompt and generating code changes...")
             changes_result = await self.code_analysis.analyze_and_generate_changes(
@@ -132,18 +148,18 @@ class SelfImprovementService:
                 logger.error(error_msg)
                 metadata["error"] = error_msg
                 # Try to cleanup: go back to main
-                await self.git.pull_latest("main")
+                await self.git.restore_main()
                 return (False, error_msg, metadata)
 
             # 8. Validate changes
             logger.info("Step 6/10: Validating changes...")
-            valid, error = await self.code_analysis.validate_changes()
+            valid, error = await self.code_analysis.validate_changes(changes_result["changes"])
             if not valid:
                 error_msg = f"Validation failed: {error}"
                 logger.error(error_msg)
                 metadata["error"] = error_msg
                 # Try to cleanup: go back to main
-                await self.git.pull_latest("main")
+                await self.git.restore_main()
                 return (False, error_msg, metadata)
 
             # 9. Commit changes
@@ -153,17 +169,23 @@ class SelfImprovementService:
                 logger.error(error_msg)
                 metadata["error"] = error_msg
                 # Try to cleanup: go back to main
-                await self.git.pull_latest("main")
+                await self.git.restore_main()
                 return (False, error_msg, metadata)
 
-            # 10. Get diff for logging
+            # 10-11. Get diff for logging and push branch (independent, run concurrently)
             logger.info("Step 8/10: Getting diff...")
-            diff = await self.git.get_diff("main")
-            logger.debug("Changes diff:\n%s", diff[:1000])  # Log first 1000 chars
-
-            # 11. Push branch
             logger.info("Step 9/10: Pushing branch to GitHub...")
-            if not await self.git.push_branch(branch_name):
+            if logger.isEnabledFor(logging.DEBUG):
+                # Only the start of the diff is logged, so stop git after that much
+                diff, pushed = await asyncio.gather(
+                    self.git.get_diff("main", max_bytes=DIFF_LOG_BYTES),
+                    self.git.push_branch(branch_name),
+                )
+                logger.debug("Changes diff:\n%s", diff)
+            else:
+                pushed = await self.git.push_branch(branch_name)
+
+            if not pushed:
                 error_msg = f"Failed to push branch '{branch_name}' to GitHub"
                 logger.error(error_msg)
                 metadata["error"] = error_msg
@@ -173,7 +195,7 @@ class SelfImprovementService:
             logger.info("Step 10/10: Creating pull request...")
             try:
                 pr = await self.github.create_pull_request(
-                    repo=self.config.github.repository,
+                    repo=self._github_repo,
                     title=changes_result["pr_title"],
                     body=changes_result["pr_body"],
                     head_branch=branch_name,
@@ -197,7 +219,7 @@ class SelfImprovementService:
                 )
 
                 # Return to main branch
-                await self.git.pull_latest("main")
+                await self.git.restore_main()
 
                 return (True, pr_url, metadata)
 
@@ -206,7 +228,7 @@ class SelfImprovementService:
                 logger.error(error_msg, exc_info=True)
                 metadata["error"] = error_msg
                 # Return to main branch
-                await self.git.pull_latest("main")
+                await self.git.restore_main()
                 return (False, error_msg, metadata)
 
         except Exception as e:
@@ -217,7 +239,7 @@ class SelfImprovementService:
 
             # Try to return to main branch
             try:
-                await self.git.pull_latest("main")
+                await self.git.restore_main()
             except Exception:
                 pass  # Best effort cleanup
 
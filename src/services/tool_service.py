@@ -1,18 +1,55 @@
 """Service for tracking tool executions."""
 
-import json
 import logging
 from typing import Optional
 
 from ..orm.tool_execution import ToolExecution
-from .database import get_db_service
+from .batch_writer import BatchInsertWriter
 
 logger = logging.getLogger(__name__)
 
 
+class ToolExecutionWriter(BatchInsertWriter):
+    """Batch writer for tool execution rows."""
+
+    def __init__(
+        self,
+        max_batch_size: int = 100,
+        flush_interval: float = 0.1,
+        max_queue_size: int = 1000,
+    ):
+        super().__init__(ToolExecution, max_batch_size, flush_interval, max_queue_size)
+
+
+# Global tool execution writer instance
+tool_execution_writer: ToolExecutionWriter | None = None
+
+
+def get_tool_execution_writer() -> ToolExecutionWriter:
+    """Get the global tool execution writer, creating it on first use."""
+    global tool_execution_writer
+    if tool_execution_writer is None:
+        tool_execution_writer = ToolExecutionWriter()
+    return tool_execution_writer
+
+
+async def close_tool_execution_writer() -> None:
+    """Flush and stop the global tool execution writer.
+
+    Safe to call more than once (combined mode shuts down both the polling bot
+    and the webhook server); the writer restarts if rows arrive afterwards.
+    """
+    if tool_execution_writer is not None:
+        await tool_execution_writer.close()
+
+
 class ToolService:
     """Service for managing tool execution tracking."""
 
+    def __init__(self, writer: Optional[ToolExecutionWriter] = None):
+        # Resolved once per service rather than on every recorded execution
+        self._writer = writer or get_tool_execution_writer()
+
     async def record_execution(
         self,
         tool_name: str,
@@ -28,34 +65,32 @@ class ToolService:
         cache_creation_input_tokens: Optional[int] = None,
         cache_read_input_tokens: Optional[int] = None,
         thinking_content: Optional[str] = None,
-    ) -> ToolExecution:
-        """Record a tool execution in the database."""
-        db = get_db_service()
-        async with db.session() as session:
-            execution = ToolExecution(
-                conversation_id=conversation_id,
-                tool_name=tool_name,
-                tool_call_id=tool_call_id,
-                input_args=json.dumps(input_args),
-                output_result=output_result,
-                success=success,
-                error_message=error_message,
-                execution_time_ms=execution_time_ms,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                cache_creation_input_tokens=cache_creation_input_tokens,
-                cache_read_input_tokens=cache_read_input_tokens,
-                thinking_content=thinking_content,
-            )
-            session.add(execution)
-            await session.commit()
-            await session.refresh(execution)
-
-            logger.debug(
-                "Recorded tool execution: %s (success=%s, time=%sms)",
-                tool_name,
-                success,
-                execution_time_ms,
-            )
-
-            return execution
+    ) -> None:
+        """Queue a tool execution to be recorded in the database.
+
+        Waits only if the writer's queue is full.
+        """
+        await self._writer.put(
+            {
+                "conversation_id": conversation_id,
+                "tool_name": tool_name,
+                "tool_call_id": tool_call_id,
+                "input_args": input_args,
+                "output_result": output_result,
+                "success": success,
+                "error_message": error_message,
+                "execution_time_ms": execution_time_ms,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cache_creation_input_tokens": cache_creation_input_tokens,
+                "cache_read_input_tokens": cache_read_input_tokens,
+                "thinking_content": thinking_content,
+            }
+        )
+
+        logger.debug(
+            "Queued tool execution: %s (success=%s, time=%sms)",
+            tool_name,
+            success,
+            execution_time_ms,
+        )
@@ -1,16 +1,30 @@
 """GitHub webhook event handler."""
 
 import logging
+import time
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import exists, select
 
 from ..orm.pr_comment import PRComment
 from ..orm.selfimprovement_request import SelfImprovementRequest
 from .database import DatabaseService
+from .lru_cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Seconds to remember that a PR is not a bot PR (it may be recorded shortly after opening)
+NON_BOT_PR_TTL = 60.0
+
+# PRs whose bot/non-bot status is remembered in memory, least recently used evicted first
+BOT_PR_CACHE_MAX = 1_000
+
+# Processed comment IDs remembered in memory, least recently used evicted first
+PROCESSED_COMMENTS_MAX = 10_000
+
+# Webhook delivery IDs remembered for deduplication, least recently used evicted first
+SEEN_DELIVERIES_MAX = 10_000
+
 
 class WebhookHandler:
     """Routes GitHub webhook events to appropriate handlers."""
@@ -31,6 +45,12 @@ class WebhookHandler:
         self.db_service = db_service
         self.pr_improvement_service = pr_improvement_service
         self.owner_login = owner_login
+        # pr_number -> (is_bot_pr, checked_at)
+        self._bot_pr_cache: LRUCache[int, tuple[bool, float]] = LRUCache(BOT_PR_CACHE_MAX)
+        # Comment IDs known to be processed, in LRU order
+        self._processed_comments: LRUCache[int, None] = LRUCache(PROCESSED_COMMENTS_MAX)
+        # Delivery IDs already handled
+        self._seen_deliveries: LRUCache[str, None] = LRUCache(SEEN_DELIVERIES_MAX)
 
     async def handle_event(
         self,
@@ -45,8 +65,16 @@ class WebhookHandler:
             payload: Webhook payload
             delivery_id: GitHub delivery ID for logging
         """
+        # GitHub retries deliveries; handle each delivery ID once. Deliveries
+        # without an ID can't be matched up, so they are never deduplicated.
+        if delivery_id:
+            if delivery_id in self._seen_deliveries:
+                logger.info("Ignoring duplicate webhook delivery: %s", delivery_id)
+                return
+            self._seen_deliveries.put(delivery_id, None)
+
         logger.info(
-            f"Processing webhook event: type={event_type}, delivery_id={delivery_id}"
+            "Processing webhook event: type=%s, delivery_id=%s", event_type, delivery_id
         )
 
         try:
@@ -57,13 +85,17 @@ class WebhookHandler:
             elif event_type == "ping":
                 logger.info("Received ping event (webhook configured successfully)")
             else:
-                logger.info(f"Ignoring unhandled event type: {event_type}")
+                logger.info("Ignoring unhandled event type: %s", event_type)
 
         except Exception as e:
             logger.error(
-                f"Error processing webhook event {delivery_id}: {e}",
+                "Error processing webhook event %s: %s",
+                delivery_id,
+                e,
                 exc_info=True
             )
+            # Let a redelivery of a failed event be retried
+            self._seen_deliveries.pop(delivery_id, None)
 
     async def _handle_issue_comment(
         self,
@@ -79,7 +111,7 @@ class WebhookHandler:
         # Extract comment details
         action = payload.get("action")
         if action not in ["created", "edited"]:
-            logger.debug(f"Ignoring issue_comment action: {action}")
+            logger.debug("Ignoring issue_comment action: %s", action)
             return
 
         comment = payload.get("comment", {})
@@ -92,30 +124,33 @@ class WebhookHandler:
 
         # Only process pull requests (not regular issues)
         if "pull_request" not in issue:
-            logger.debug(f"Ignoring non-PR comment: issue #{pr_number}")
+            logger.debug("Ignoring non-PR comment: issue #%s", pr_number)
             return
 
         logger.info(
-            f"PR comment: pr_number={pr_number}, comment_id={comment_id}, "
-            f"commenter={commenter_login}"
+            "PR comment: pr_number=%s, comment_id=%s, commenter=%s",
+            pr_number,
+            comment_id,
+            commenter_login,
         )
 
-        # Check if this PR was created by the bot
-        if not await self._is_bot_pr(pr_number):
-            logger.debug(f"Ignoring comment on non-bot PR #{pr_number}")
-            return
-
         # Check if commenter is the owner
         if commenter_login != self.owner_login:
             logger.info(
-                f"Ignoring comment from non-owner: {commenter_login} "
-                f"(owner: {self.owner_login})"
+                "Ignoring comment from non-owner: %s (owner: %s)",
+                commenter_login,
+                self.owner_login,
             )
             return
 
-        # Check if already processed
-        if await self._is_comment_processed(comment_id):
-            logger.debug(f"Comment {comment_id} already processed, skipping")
+        # Check if this PR was created by the bot and the comment is new (one query)
+        is_bot_pr, is_processed = await self._check_pr_and_comment(pr_number, comment_id)
+        if not is_bot_pr:
+            logger.debug("Ignoring comment on non-bot PR #%s", pr_number)
+            return
+
+        if is_processed:
+            logger.debug("Comment %s already processed, skipping", comment_id)
             return
 
         # Process the PR improvement
@@ -143,7 +178,7 @@ class WebhookHandler:
         # Extract comment details
         action = payload.get("action")
         if action not in ["created", "edited"]:
-            logger.debug(f"Ignoring review_comment action: {action}")
+            logger.debug("Ignoring review_comment action: %s", action)
             return
 
         comment = payload.get("comment", {})
@@ -157,26 +192,30 @@ class WebhookHandler:
         pr_number = pull_request.get("number")
 
         logger.info(
-            f"PR review comment: pr_number={pr_number}, comment_id={comment_id}, "
-            f"commenter={commenter_login}, file={file_path}"
+            "PR review comment: pr_number=%s, comment_id=%s, commenter=%s, file=%s",
+            pr_number,
+            comment_id,
+            commenter_login,
+            file_path,
         )
 
-        # Check if this PR was created by the bot
-        if not await self._is_bot_pr(pr_number):
-            logger.debug(f"Ignoring review comment on non-bot PR #{pr_number}")
-            return
-
         # Check if commenter is the owner
         if commenter_login != self.owner_login:
             logger.info(
-                f"Ignoring review comment from non-owner: {commenter_login} "
-                f"(owner: {self.owner_login})"
+                "Ignoring review comment from non-owner: %s (owner: %s)",
+                commenter_login,
+                self.owner_login,
             )
             return
 
-        # Check if already processed
-        if await self._is_comment_processed(comment_id):
-            logger.debug(f"Review comment {comment_id} already processed, skipping")
+        # Check if this PR was created by the bot and the comment is new (one query)
+        is_bot_pr, is_processed = await self._check_pr_and_comment(pr_number, comment_id)
+        if not is_bot_pr:
+            logger.debug("Ignoring review comment on non-bot PR #%s", pr_number)
+            return
+
+        if is_processed:
+            logger.debug("Review comment %s already processed, skipping", comment_id)
             return
 
         # Process the PR improvement with file context
@@ -190,39 +229,49 @@ class WebhookHandler:
             diff_hunk=diff_hunk,
         )
 
-    async def _is_bot_pr(self, pr_number: int) -> bool:
-        """Check if PR was created by the bot via /selfimprovement.
+    async def _check_pr_and_comment(
+        self, pr_number: int, comment_id: int
+    ) -> tuple[bool, bool]:
+        """Check whether a PR was created by the bot and a comment was processed.
+
+        Cached answers are used where possible; otherwise both are fetched
+        in a single query.
 
         Args:
             pr_number: GitHub PR number
+            comment_id: GitHub comment ID
 
         Returns:
-            True if PR was created by bot, False otherwise
+            Tuple of (is_bot_pr, is_processed)
         """
+        cached = self._bot_pr_cache.get(pr_number)
+        if cached and not cached[0] and time.monotonic() - cached[1] >= NON_BOT_PR_TTL:
+            # Expired negative answer: drop it and ask the database again
+            self._bot_pr_cache.pop(pr_number)
+            cached = None
+        if cached:
+            if not cached[0]:
+                return (False, False)
+            if comment_id in self._processed_comments:
+                return (True, True)
+
         async with self.db_service.session() as session:
             result = await session.execute(
-                select(SelfImprovementRequest).where(
-                    SelfImprovementRequest.pr_number == pr_number
+                select(
+                    exists().where(SelfImprovementRequest.pr_number == pr_number),
+                    exists().where(
+                        PRComment.comment_id == comment_id,
+                        PRComment.processed == True,  # noqa: E712
+                    ),
                 )
             )
-            request = result.scalar_one_or_none()
-            return request is not None
+            is_bot_pr, is_processed = result.one()
 
-    async def _is_comment_processed(self, comment_id: int) -> bool:
-        """Check if comment has already been processed.
+        # Bot PRs stay bot PRs, so only negative answers expire
+        self._bot_pr_cache.put(pr_number, (is_bot_pr, time.monotonic()))
 
-        Args:
-            comment_id: GitHub comment ID
+        # A processed comment stays processed; unprocessed ones may change any time
+        if is_processed:
+            self._processed_comments.put(comment_id, None)
 
-        Returns:
-            True if comment was processed, False otherwise
-        """
-        async with self.db_service.session() as session:
-            result = await session.execute(
-                select(PRComment).where(
-                    PRComment.comment_id == comment_id,
-                    PRComment.processed == True  # noqa: E712
-                )
-            )
-            comment = result.scalar_one_or_none()
-            return comment is not None
+        return (is_bot_pr, is_processed)
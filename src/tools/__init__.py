@@ -6,14 +6,14 @@ from .systemd_logs import search_systemd_logs
 from .web_search import search_web
 from .wikipedia import search_wikipedia
 
-# All available tools
-ALL_TOOLS = [
+# All available tools (a tuple, so the shared registry can't be mutated)
+ALL_TOOLS = (
     search_web,
     calculator,
     search_wikipedia,
     search_logs,
     search_systemd_logs,
-]
+)
 
 __all__ = [
     "ALL_TOOLS",
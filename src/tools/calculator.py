@@ -1,13 +1,143 @@
 """Calculator tool for precise mathematical operations."""
 
+import ast
 import logging
 import math
-import re
+import operator
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any
 
 from langchain_core.tools import tool
 
 logger = logging.getLogger(__name__)
 
+# Names an expression may reference (read-only, shared by every evaluation)
+_ALLOWED_NAMES = MappingProxyType({
+    "sqrt": math.sqrt,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "log": math.log,
+    "exp": math.exp,
+    "pi": math.pi,
+    "e": math.e,
+})
+
+# Largest exponent accepted by ** (9**9**9 would otherwise pin a worker)
+MAX_EXPONENT = 1000
+
+# Largest integer, in bits, an operation may produce
+MAX_INT_BITS = 10_000
+
+# Binary operators an expression may use
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+
+# Unary operators an expression may use
+_UNARY_OPS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+# AST node types an expression may contain
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Call,
+    ast.Name,
+    ast.Load,
+    *_BIN_OPS,
+    *_UNARY_OPS,
+)
+
+
+def _parse(expression: str) -> ast.Expression:
+    """Parse and validate an expression against the whitelist.
+
+    Raises:
+        SyntaxError: If the expression does not parse.
+        ValueError: If the expression uses anything outside the whitelist.
+    """
+    tree = ast.parse(expression.strip(), mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Name) and node.id not in _ALLOWED_NAMES:
+            raise ValueError(f"Unknown name: {node.id}")
+        if isinstance(node, ast.Call) and not isinstance(node.func, ast.Name):
+            raise ValueError("Only sqrt, sin, cos, tan, log and exp can be called")
+        if isinstance(node, ast.Constant) and (
+            isinstance(node.value, bool) or not isinstance(node.value, (int, float))
+        ):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+    return tree
+
+
+def _check_size(op: type, left: Any, right: Any) -> None:
+    """Reject an operation whose result would be unreasonably large.
+
+    Raises:
+        ValueError: If the operands are over the limits.
+    """
+    if op is ast.Pow:
+        if abs(right) > MAX_EXPONENT:
+            raise ValueError(f"exponent larger than {MAX_EXPONENT}")
+        if isinstance(left, int) and isinstance(right, int) and right > 0:
+            if left.bit_length() * right > MAX_INT_BITS:
+                raise ValueError("result too large")
+    elif op is ast.Mult and isinstance(left, int) and isinstance(right, int):
+        if left.bit_length() + right.bit_length() > MAX_INT_BITS:
+            raise ValueError("result too large")
+
+
+def _eval_node(node: ast.AST) -> Any:
+    """Evaluate a validated expression node, checking sizes before each operation."""
+    if isinstance(node, ast.Expression):
+        return _eval_node(node.body)
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        return _ALLOWED_NAMES[node.id]
+    if isinstance(node, ast.UnaryOp):
+        return _UNARY_OPS[type(node.op)](_eval_node(node.operand))
+    if isinstance(node, ast.BinOp):
+        left = _eval_node(node.left)
+        right = _eval_node(node.right)
+        _check_size(type(node.op), left, right)
+        return _BIN_OPS[type(node.op)](left, right)
+    if isinstance(node, ast.Call):
+        return _eval_node(node.func)(*(_eval_node(arg) for arg in node.args))
+    raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+
+@lru_cache(maxsize=512)
+def _evaluate(expression: str) -> str:
+    """Validate and evaluate a normalized expression, caching the result text."""
+    try:
+        tree = _parse(expression)
+    except SyntaxError as e:
+        return f"Syntax error in expression: {str(e)}"
+    except ValueError as e:
+        return f"Error: Expression not allowed ({str(e)}): {expression}"
+
+    try:
+        result = _eval_node(tree)
+        logger.info("Calculator evaluated: %s = %s", expression, result)
+
+        return str(result)
+
+    except Exception as e:
+        logger.error("Calculator error: %s", e, exc_info=True)
+        return f"Error evaluating expression: {str(e)}"
+
 
 @tool
 def calculator(expression: str) -> str:
@@ -26,33 +156,7 @@ def calculator(expression: str) -> str:
     Returns:
         Result of the calculation
     """
-    try:
-        # Sanitize input - allow only safe characters
-        safe_chars = re.compile(r"^[0-9+\-*/().sqrt\s,sincotanlogexpie]+$")
-        if not safe_chars.match(expression):
-            return f"Error: Expression contains invalid characters: {expression}"
-
-        # Safe evaluation with limited namespace
-        safe_dict = {
-            "__builtins__": {},
-            "math": math,
-            "sqrt": math.sqrt,
-            "sin": math.sin,
-            "cos": math.cos,
-            "tan": math.tan,
-            "log": math.log,
-            "exp": math.exp,
-            "pi": math.pi,
-            "e": math.e,
-        }
-
-        result = eval(expression, safe_dict)
-        logger.info("Calculator evaluated: %s = %s", expression, result)
-
-        return str(result)
-
-    except SyntaxError as e:
-        return f"Syntax error in expression: {str(e)}"
-    except Exception as e:
-        logger.error("Calculator error: %s", e, exc_info=True)
-        return f"Error evaluating expression: {str(e)}"
+    # Normalize so trivially different spellings share a cache entry
+    result = _evaluate(" ".join(expression.split()).lower())
+    logger.debug("Calculator cache: %s", _evaluate.cache_info())
+    return result
@@ -1,13 +1,12 @@
 """Log search tool for querying bot activity logs from the database."""
 
 import asyncio
-import json
 import logging
 from datetime import datetime, timedelta
 from typing import Optional
 
 from langchain_core.tools import tool
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import Text, case, distinct, func, literal_column, or_, select, type_coerce
 
 from ..services.database import get_db_service
 from ..orm.tool_execution import ToolExecution
@@ -16,9 +15,38 @@ from ..orm.processed_mention import ProcessedMention
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip while streaming search results
+STREAM_BATCH_SIZE = 50
+
+# Characters shown from tool results and conversation messages
+PREVIEW_CHARS = 200
+MESSAGE_PREVIEW_CHARS = 300
+
+# One template per report row; optional lines are passed in already formatted (or empty)
+_TOOL_ROW = "[{timestamp}] {status} - {tool_name}\n{args}{outcome}{timing}{tokens}\n"
+_CONVERSATION_ROW = (
+    "[{timestamp}] {icon} {role}\n  Thread: {thread_uri}\n{author}  Message: {message}\n\n"
+)
+_MENTION_ROW = "[{timestamp}] Mention processed\n  URI: {uri}\n  Author: {author}\n{thread}\n"
+
+
+def _timestamp(value: datetime) -> str:
+    """Format a row timestamp as YYYY-MM-DD HH:MM:SS (cheaper than strftime)."""
+    # Cut off any UTC offset isoformat appends for aware datetimes
+    return value.isoformat(sep=" ", timespec="seconds")[:19]
+
+
+def _contains(column, search_term: str):
+    """Case-insensitive substring match on a text column.
+
+    SQLite's LIKE already ignores ASCII case, the same folding lower() does,
+    so this skips the lower() calls ilike() adds to every row it scans.
+    """
+    return column.contains(search_term, autoescape=True)
+
 
 @tool
-def search_logs(
+async def search_logs(
     hours_ago: int = 24,
     log_type: str = "all",
     search_term: Optional[str] = None,
@@ -60,11 +88,11 @@ def search_logs(
     # Calculate time threshold
     time_threshold = datetime.utcnow() - timedelta(hours=hours_ago)
 
-    # Run async database queries in sync context
+    # Runs on the caller's event loop, sharing the database service's pool
     try:
-        return asyncio.run(_search_logs_async(
+        return await _search_logs_async(
             time_threshold, log_type, search_term, limit, hours_ago
-        ))
+        )
     except Exception as e:
         logger.error(f"Error searching logs: {e}", exc_info=True)
         return f"Error searching logs: {str(e)}"
@@ -79,32 +107,22 @@ async def _search_logs_async(
 ) -> str:
     """Async helper to perform database queries."""
     db = get_db_service()
-    results = []
 
-    async with db.session() as session:
-        # Search tool executions
-        if log_type in ["all", "tools"]:
-            tool_results = await _search_tool_executions(
-                session, time_threshold, search_term, limit
-            )
-            if tool_results:
-                results.append(tool_results)
+    # Tool executions, conversation history, processed mentions
+    searches = []
+    if log_type in ["all", "tools"]:
+        searches.append(_search_tool_executions)
+    if log_type in ["all", "conversations"]:
+        searches.append(_search_conversations)
+    if log_type in ["all", "mentions"]:
+        searches.append(_search_mentions)
 
-        # Search conversation history
-        if log_type in ["all", "conversations"]:
-            conv_results = await _search_conversations(
-                session, time_threshold, search_term, limit
-            )
-            if conv_results:
-                results.append(conv_results)
+    async def run_search(search):
+        # Each search gets its own session (and pooled connection) so they can overlap
+        async with db.read_session() as session:
+            return await search(session, time_threshold, search_term, limit)
 
-        # Search processed mentions
-        if log_type in ["all", "mentions"]:
-            mention_results = await _search_mentions(
-                session, time_threshold, search_term, limit
-            )
-            if mention_results:
-                results.append(mention_results)
+    results = [r for r in await asyncio.gather(*map(run_search, searches)) if r]
 
     # Format results
     if not results:
@@ -113,206 +131,268 @@ async def _search_logs_async(
             f"(log_type={log_type}, search_term={search_term or 'none'})"
         )
 
-    header = f"=== Log Search Results ===\n"
-    header += f"Time period: Last {hours_ago} hours (since {time_threshold.strftime('%Y-%m-%d %H:%M:%S')} UTC)\n"
-    header += f"Log type: {log_type}\n"
+    parts = ["=== Log Search Results ===\n"]
+    parts.append(f"Time period: Last {hours_ago} hours (since {time_threshold.strftime('%Y-%m-%d %H:%M:%S')} UTC)\n")
+    parts.append(f"Log type: {log_type}\n")
     if search_term:
-        header += f"Search term: '{search_term}'\n"
-    header += f"Limit: {limit} per type\n"
-    header += "=" * 50 + "\n\n"
+        parts.append(f"Search term: '{search_term}'\n")
+    parts.append(f"Limit: {limit} per type\n")
+    parts.append("=" * 50 + "\n\n")
 
-    return header + "\n\n".join(results)
+    parts.append("\n\n".join(results))
+    return "".join(parts)
 
 
 async def _search_tool_executions(session, time_threshold, search_term, limit):
     """Search tool execution logs."""
-    query = select(ToolExecution).where(
-        and_(
-            ToolExecution.created_at >= time_threshold,
-            ToolExecution.is_deleted == False
-        )
-    )
+    conditions = [
+        ToolExecution.created_at >= time_threshold,
+        ToolExecution.is_deleted == False,  # noqa: E712
+    ]
 
     # Apply search term filter if provided
     if search_term:
-        search_pattern = f"%{search_term}%"
-        query = query.where(
+        conditions.append(
             or_(
-                ToolExecution.tool_name.ilike(search_pattern),
-                ToolExecution.input_args.ilike(search_pattern),
-                ToolExecution.output_result.ilike(search_pattern),
-                ToolExecution.error_message.ilike(search_term)
+                _contains(ToolExecution.tool_name, search_term),
+                # Match against the stored JSON text, not a JSON-encoded pattern
+                _contains(type_coerce(ToolExecution.input_args, Text), search_term),
+                _contains(ToolExecution.output_result, search_term),
+                _contains(ToolExecution.error_message, search_term),
             )
         )
 
-    query = query.order_by(ToolExecution.created_at.desc()).limit(limit)
-    result = await session.execute(query)
-    executions = result.scalars().all()
-
-    if not executions:
-        return None
-
-    output = f"### TOOL EXECUTIONS ({len(executions)} results)\n\n"
-
-    for exe in executions:
-        timestamp = exe.created_at.strftime("%Y-%m-%d %H:%M:%S")
-        status = "✓ SUCCESS" if exe.success else "✗ FAILED"
-
-        output += f"[{timestamp}] {status} - {exe.tool_name}\n"
-
-        # Parse and format input args
-        try:
-            args = json.loads(exe.input_args) if exe.input_args else {}
+    query = (
+        # Only the columns the report shows; the result text is cut down in SQL
+        select(
+            ToolExecution.created_at,
+            ToolExecution.success,
+            ToolExecution.tool_name,
+            ToolExecution.input_args,
+            func.substr(ToolExecution.output_result, 1, PREVIEW_CHARS + 1).label("output_preview"),
+            ToolExecution.error_message,
+            ToolExecution.execution_time_ms,
+            ToolExecution.input_tokens,
+            ToolExecution.output_tokens,
+            ToolExecution.cache_read_input_tokens,
+        )
+        .where(*conditions)
+        .order_by(ToolExecution.created_at.desc())
+        .limit(limit)
+    )
+    # Rows are formatted as they stream in; the heading with the count is filled in after
+    parts = [""]
+    count = 0
+    executions = await session.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+    async for exe in executions:
+        count += 1
+
+        # Format input args
+        args = exe.input_args
+        args_line = ""
+        if isinstance(args, dict):
             if args:
-                args_str = ", ".join(f"{k}={v}" for k, v in args.items())
-                output += f"  Args: {args_str}\n"
-        except json.JSONDecodeError:
-            output += f"  Args: {exe.input_args}\n"
+                args_line = "  Args: " + ", ".join(f"{k}={v}" for k, v in args.items()) + "\n"
+        elif args:
+            args_line = f"  Args: {args}\n"
 
         # Show result or error
-        if exe.success and exe.output_result:
-            result_preview = exe.output_result[:200]
-            if len(exe.output_result) > 200:
+        outcome_line = ""
+        if exe.success and exe.output_preview:
+            result_preview = exe.output_preview[:PREVIEW_CHARS]
+            if len(exe.output_preview) > PREVIEW_CHARS:
                 result_preview += "..."
-            output += f"  Result: {result_preview}\n"
+            outcome_line = f"  Result: {result_preview}\n"
         elif exe.error_message:
-            output += f"  Error: {exe.error_message}\n"
+            outcome_line = f"  Error: {exe.error_message}\n"
 
         # Show token usage
-        if exe.execution_time_ms:
-            output += f"  Execution time: {exe.execution_time_ms}ms\n"
+        timing_line = (
+            f"  Execution time: {exe.execution_time_ms}ms\n" if exe.execution_time_ms else ""
+        )
 
+        tokens_line = ""
         if exe.input_tokens or exe.output_tokens:
-            token_info = f"  Tokens: in={exe.input_tokens or 0}, out={exe.output_tokens or 0}"
+            tokens_line = f"  Tokens: in={exe.input_tokens or 0}, out={exe.output_tokens or 0}"
             if exe.cache_read_input_tokens:
-                token_info += f", cached={exe.cache_read_input_tokens}"
-            output += token_info + "\n"
-
-        output += "\n"
+                tokens_line += f", cached={exe.cache_read_input_tokens}"
+            tokens_line += "\n"
+
+        parts.append(
+            _TOOL_ROW.format_map({
+                "timestamp": _timestamp(exe.created_at),
+                "status": "✓ SUCCESS" if exe.success else "✗ FAILED",
+                "tool_name": exe.tool_name,
+                "args": args_line,
+                "outcome": outcome_line,
+                "timing": timing_line,
+                "tokens": tokens_line,
+            })
+        )
 
-    # Add summary statistics
-    total_success = sum(1 for e in executions if e.success)
-    total_failed = len(executions) - total_success
-    tool_counts = {}
-    for e in executions:
-        tool_counts[e.tool_name] = tool_counts.get(e.tool_name, 0) + 1
+    if not count:
+        return None
+    parts[0] = f"### TOOL EXECUTIONS ({count} results)\n\n"
+
+    # Add summary statistics, aggregated in SQL over every match (not just the page).
+    # Grouping on tool_name || '' stops SQLite from scanning all of
+    # idx_tool_executions_tool_name to skip a sort; the time-range index is far cheaper
+    tool_key = ToolExecution.tool_name.concat(literal_column("''"))
+    tool_counts = (
+        await session.execute(
+            select(
+                tool_key,
+                func.count(),
+                func.sum(case((ToolExecution.success == True, 1), else_=0)),  # noqa: E712
+            )
+            .where(*conditions)
+            .group_by(tool_key)
+            .order_by(func.count().desc())
+        )
+    ).all()
+    total_success = sum(successes for _, _, successes in tool_counts)
+    total_failed = sum(count for _, count, _ in tool_counts) - total_success
 
-    output += f"Summary: {total_success} successful, {total_failed} failed\n"
-    output += f"Tools used: {', '.join(f'{tool}({count})' for tool, count in tool_counts.items())}\n"
+    parts.append(f"Summary: {total_success} successful, {total_failed} failed\n")
+    parts.append(f"Tools used: {', '.join(f'{tool}({count})' for tool, count, _ in tool_counts)}\n")
 
-    return output
+    return "".join(parts)
 
 
 async def _search_conversations(session, time_threshold, search_term, limit):
     """Search conversation history logs."""
-    query = select(ConversationHistory).where(
-        and_(
-            ConversationHistory.created_at >= time_threshold,
-            ConversationHistory.is_deleted == False
-        )
-    )
+    conditions = [
+        ConversationHistory.created_at >= time_threshold,
+        ConversationHistory.is_deleted == False,  # noqa: E712
+    ]
 
     # Apply search term filter if provided
     if search_term:
-        search_pattern = f"%{search_term}%"
-        query = query.where(
+        conditions.append(
             or_(
-                ConversationHistory.message_content.ilike(search_pattern),
-                ConversationHistory.author_did.ilike(search_pattern)
+                _contains(ConversationHistory.content, search_term),
+                _contains(ConversationHistory.author_did, search_term),
             )
         )
 
-    query = query.order_by(ConversationHistory.created_at.desc()).limit(limit)
-    result = await session.execute(query)
-    conversations = result.scalars().all()
-
-    if not conversations:
-        return None
-
-    output = f"### CONVERSATION HISTORY ({len(conversations)} results)\n\n"
-
-    for conv in conversations:
-        timestamp = conv.created_at.strftime("%Y-%m-%d %H:%M:%S")
-        role_icon = "👤" if conv.role == "user" else "🤖"
-
-        output += f"[{timestamp}] {role_icon} {conv.role.upper()}\n"
-        output += f"  Thread: {conv.thread_uri}\n"
-
-        if conv.author_did:
-            output += f"  Author: {conv.author_did}\n"
+    query = (
+        select(
+            ConversationHistory.created_at,
+            ConversationHistory.role,
+            ConversationHistory.thread_uri,
+            ConversationHistory.author_did,
+            func.substr(ConversationHistory.content, 1, MESSAGE_PREVIEW_CHARS + 1).label(
+                "content_preview"
+            ),
+        )
+        .where(*conditions)
+        .order_by(ConversationHistory.created_at.desc())
+        .limit(limit)
+    )
+    # Rows are formatted as they stream in; the heading with the count is filled in after
+    parts = [""]
+    count = 0
+    conversations = await session.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+    async for conv in conversations:
+        count += 1
 
         # Show message content preview
-        content_preview = conv.message_content[:300]
-        if len(conv.message_content) > 300:
+        content_preview = conv.content_preview[:MESSAGE_PREVIEW_CHARS]
+        if len(conv.content_preview) > MESSAGE_PREVIEW_CHARS:
             content_preview += "..."
-        output += f"  Message: {content_preview}\n"
 
-        # Show token usage if available
-        if conv.input_tokens or conv.output_tokens:
-            token_info = f"  Tokens: in={conv.input_tokens or 0}, out={conv.output_tokens or 0}"
-            if conv.cache_read_input_tokens:
-                token_info += f", cached={conv.cache_read_input_tokens}"
-            output += token_info + "\n"
-
-        output += "\n"
+        parts.append(
+            _CONVERSATION_ROW.format_map({
+                "timestamp": _timestamp(conv.created_at),
+                "icon": "👤" if conv.role == "user" else "🤖",
+                "role": conv.role.upper(),
+                "thread_uri": conv.thread_uri,
+                "author": f"  Author: {conv.author_did}\n" if conv.author_did else "",
+                "message": content_preview,
+            })
+        )
 
-    # Add summary statistics
-    user_messages = sum(1 for c in conversations if c.role == "user")
-    assistant_messages = len(conversations) - user_messages
-    unique_threads = len(set(c.thread_uri for c in conversations))
+    if not count:
+        return None
+    parts[0] = f"### CONVERSATION HISTORY ({count} results)\n\n"
+
+    # Add summary statistics, aggregated in SQL over every match (not just the page)
+    total, user_messages, unique_threads = (
+        await session.execute(
+            select(
+                func.count(),
+                func.sum(case((ConversationHistory.role == "user", 1), else_=0)),
+                func.count(distinct(ConversationHistory.thread_uri)),
+            ).where(*conditions)
+        )
+    ).one()
+    assistant_messages = total - user_messages
 
-    output += f"Summary: {user_messages} user messages, {assistant_messages} assistant messages\n"
-    output += f"Unique threads: {unique_threads}\n"
+    parts.append(f"Summary: {user_messages} user messages, {assistant_messages} assistant messages\n")
+    parts.append(f"Unique threads: {unique_threads}\n")
 
-    return output
+    return "".join(parts)
 
 
 async def _search_mentions(session, time_threshold, search_term, limit):
     """Search processed mention logs."""
-    query = select(ProcessedMention).where(
-        and_(
-            ProcessedMention.created_at >= time_threshold,
-            ProcessedMention.is_deleted == False
-        )
-    )
+    conditions = [
+        ProcessedMention.created_at >= time_threshold,
+        ProcessedMention.is_deleted == False,  # noqa: E712
+    ]
 
     # Apply search term filter if provided
     if search_term:
-        search_pattern = f"%{search_term}%"
-        query = query.where(
+        conditions.append(
             or_(
-                ProcessedMention.mention_uri.ilike(search_pattern),
-                ProcessedMention.author_did.ilike(search_pattern),
-                ProcessedMention.thread_uri.ilike(search_pattern)
+                _contains(ProcessedMention.mention_uri, search_term),
+                _contains(ProcessedMention.author_did, search_term),
+                _contains(ProcessedMention.thread_uri, search_term),
             )
         )
 
-    query = query.order_by(ProcessedMention.created_at.desc()).limit(limit)
-    result = await session.execute(query)
-    mentions = result.scalars().all()
+    query = (
+        select(
+            ProcessedMention.created_at,
+            ProcessedMention.mention_uri,
+            ProcessedMention.author_did,
+            ProcessedMention.thread_uri,
+        )
+        .where(*conditions)
+        .order_by(ProcessedMention.created_at.desc())
+        .limit(limit)
+    )
+    # Rows are formatted as they stream in; the heading with the count is filled in after
+    parts = [""]
+    count = 0
+    mentions = await session.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+    async for mention in mentions:
+        count += 1
+        parts.append(
+            _MENTION_ROW.format_map({
+                "timestamp": _timestamp(mention.created_at),
+                "uri": mention.mention_uri,
+                "author": mention.author_did,
+                "thread": f"  Thread: {mention.thread_uri}\n" if mention.thread_uri else "",
+            })
+        )
 
-    if not mentions:
+    if not count:
         return None
+    parts[0] = f"### PROCESSED MENTIONS ({count} results)\n\n"
+
+    # Add summary statistics, aggregated in SQL over every match (not just the page)
+    total, unique_authors, unique_threads = (
+        await session.execute(
+            select(
+                func.count(),
+                func.count(distinct(ProcessedMention.author_did)),
+                func.count(distinct(ProcessedMention.thread_uri)),
+            ).where(*conditions)
+        )
+    ).one()
 
-    output = f"### PROCESSED MENTIONS ({len(mentions)} results)\n\n"
-
-    for mention in mentions:
-        timestamp = mention.created_at.strftime("%Y-%m-%d %H:%M:%S")
-
-        output += f"[{timestamp}] Mention processed\n"
-        output += f"  URI: {mention.mention_uri}\n"
-        output += f"  Author: {mention.author_did}\n"
-
-        if mention.thread_uri:
-            output += f"  Thread: {mention.thread_uri}\n"
-
-        output += "\n"
-
-    # Add summary statistics
-    unique_authors = len(set(m.author_did for m in mentions))
-    unique_threads = len(set(m.thread_uri for m in mentions if m.thread_uri))
-
-    output += f"Summary: {len(mentions)} mentions from {unique_authors} unique authors\n"
-    output += f"Unique threads: {unique_threads}\n"
+    parts.append(f"Summary: {total} mentions from {unique_authors} unique authors\n")
+    parts.append(f"Unique threads: {unique_threads}\n")
 
-    return output
+    return "".join(parts)
@@ -1,16 +1,192 @@
 """Systemd log search tool for analyzing service failures and system logs."""
 
+import asyncio
 import logging
+import re
 import subprocess
+from datetime import datetime, timedelta
 from typing import Optional
 
 from langchain_core.tools import tool
 
+try:
+    from systemd import journal
+except ImportError:  # Optional: fall back to running journalctl
+    journal = None
+
 logger = logging.getLogger(__name__)
 
+# Priority names in syslog order (index is the numeric level)
+PRIORITIES = ("emerg", "alert", "crit", "err", "warning", "notice", "info", "debug")
+
+# Seconds before a journalctl fallback run is abandoned
+JOURNALCTL_TIMEOUT = 30
+
+# Relative "since" values such as "2 hours ago"
+_RELATIVE_SINCE = re.compile(
+    r"^(\d+)\s*(s|sec|secs|seconds?|m|min|mins|minutes?|h|hours?|d|days?|w|weeks?)\s+ago$"
+)
+
+# Seconds per unit, keyed by the first letter of the unit
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+# Absolute "since" formats accepted by the native reader
+_SINCE_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d")
+
+
+def _parse_since(since: str) -> Optional[datetime]:
+    """Parse the journalctl "since" forms the native reader supports.
+
+    Returns:
+        Local naive datetime, or None if the value needs journalctl to interpret.
+    """
+    value = since.strip().lower()
+    now = datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if value == "now":
+        return now
+    if value == "today":
+        return today
+    if value == "yesterday":
+        return today - timedelta(days=1)
+
+    match = _RELATIVE_SINCE.match(value)
+    if match:
+        return now - timedelta(seconds=int(match.group(1)) * _UNIT_SECONDS[match.group(2)[0]])
+
+    for fmt in _SINCE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _format_entry(entry: dict) -> str:
+    """Format a journal entry like journalctl's short-precise output."""
+    timestamp = entry.get("__REALTIME_TIMESTAMP")
+    identifier = entry.get("SYSLOG_IDENTIFIER") or entry.get("_COMM", "unknown")
+    pid = entry.get("_PID")
+    message = entry.get("MESSAGE", "")
+    if isinstance(message, bytes):
+        message = message.decode("utf-8", errors="replace")
+
+    stamp = timestamp.strftime("%b %d %H:%M:%S.%f") if timestamp else "-"
+    source = f"{identifier}[{pid}]" if pid else identifier
+    return f"{stamp} {entry.get('_HOSTNAME', '')} {source}: {message}"
+
+
+def _read_journal(
+    unit: Optional[str],
+    since: datetime,
+    priority: Optional[str],
+    pattern: Optional[re.Pattern[str]],
+    lines: int,
+) -> list[str]:
+    """Read the newest matching entries straight from the journal files (blocking).
+
+    Returns:
+        Formatted log lines, oldest first.
+    """
+    reader = journal.Reader(journal.LOCAL_ONLY)
+    try:
+        if unit:
+            if "." not in unit:
+                unit = f"{unit}.service"
+            # Like journalctl -u: the unit's own output plus systemd's messages about it
+            reader.add_match(_SYSTEMD_UNIT=unit)
+            reader.add_disjunction()
+            reader.add_match(UNIT=unit, _PID="1")
+            reader.add_conjunction()
+        if priority:
+            reader.log_level(PRIORITIES.index(priority))
+
+        # Walk back from the newest entry so "lines" keeps the most recent ones
+        reader.seek_tail()
+        collected: list[str] = []
+        while len(collected) < lines:
+            entry = reader.get_previous()
+            if not entry:
+                break
+            if entry["__REALTIME_TIMESTAMP"] < since:
+                break
+            if pattern is not None:
+                message = entry.get("MESSAGE", "")
+                if isinstance(message, bytes):
+                    message = message.decode("utf-8", errors="replace")
+                if not pattern.search(message):
+                    continue
+            collected.append(_format_entry(entry))
+    finally:
+        reader.close()
+
+    collected.reverse()
+    return collected
+
+
+def _run_journalctl(
+    unit: Optional[str],
+    since: str,
+    priority: Optional[str],
+    grep: Optional[str],
+    lines: int,
+) -> tuple[list[str], Optional[str]]:
+    """Run journalctl (blocking).
+
+    Returns:
+        Tuple of (log lines, error message or None).
+    """
+    cmd = ["journalctl", "--no-pager", "-n", str(lines), "--since", since]
+
+    if unit:
+        cmd.extend(["-u", unit])
+
+    if priority:
+        cmd.extend(["-p", priority])
+
+    if grep:
+        cmd.extend(["--grep", grep, "-i"])  # -i for case-insensitive
+
+    # Add output format for better parsing
+    cmd.append("--output=short-precise")
+
+    logger.info("Running journalctl command: %s", " ".join(cmd))
+
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=JOURNALCTL_TIMEOUT,
+            check=False
+        )
+    except subprocess.TimeoutExpired:
+        return [], (
+            f"Error: journalctl command timed out (>{JOURNALCTL_TIMEOUT}s). "
+            "Try narrowing your search with more specific filters."
+        )
+    except FileNotFoundError:
+        return [], "Error: journalctl command not found. systemd logging may not be available on this system."
+
+    # Check for errors
+    if result.returncode != 0:
+        error_msg = result.stderr.strip()
+        if "No journal files were found" in error_msg:
+            return [], "No journal logs found. This may be a permissions issue or systemd logging is not available."
+        elif "Failed to determine unit" in error_msg:
+            return [], f"Error: Unit '{unit}' not found. Use 'systemctl list-units' to see available units."
+        elif "Specifying boot ID" in error_msg or "Unknown time specification" in error_msg:
+            return [], f"Error: Invalid time specification '{since}'. Examples: '1 hour ago', 'today', '2024-01-18'"
+        else:
+            return [], f"Error running journalctl: {error_msg or 'Unknown error'}"
+
+    output = result.stdout.strip()
+    return (output.split('\n') if output else []), None
+
 
 @tool
-def search_systemd_logs(
+async def search_systemd_logs(
     unit: Optional[str] = None,
     since: str = "1 hour ago",
     priority: Optional[str] = None,
@@ -19,7 +195,7 @@ def search_systemd_logs(
 ) -> str:
     """Search systemd journal logs for service failures and system events.
 
-    This tool searches systemd logs using journalctl to help diagnose service
+    This tool searches the systemd journal (like journalctl) to help diagnose service
     failures, errors, and other system events. Useful for debugging the bot's
     own systemd service or investigating system-level issues.
 
@@ -57,51 +233,28 @@ def search_systemd_logs(
     # Validate and constrain parameters
     lines = max(1, min(lines, 1000))
 
-    valid_priorities = ["emerg", "alert", "crit", "err", "warning", "notice", "info", "debug"]
-    if priority and priority not in valid_priorities:
-        return f"Error: Invalid priority '{priority}'. Must be one of: {', '.join(valid_priorities)}"
-
-    # Build journalctl command
-    cmd = ["journalctl", "--no-pager", "-n", str(lines), "--since", since]
-
-    if unit:
-        cmd.extend(["-u", unit])
-
-    if priority:
-        cmd.extend(["-p", priority])
-
-    if grep:
-        cmd.extend(["--grep", grep, "-i"])  # -i for case-insensitive
-
-    # Add output format for better parsing
-    cmd.append("--output=short-precise")
+    if priority and priority not in PRIORITIES:
+        return f"Error: Invalid priority '{priority}'. Must be one of: {', '.join(PRIORITIES)}"
 
     try:
-        logger.info(f"Running journalctl command: {' '.join(cmd)}")
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=30,
-            check=False
-        )
+        since_time = _parse_since(since) if journal is not None else None
+        if since_time is not None:
+            # Read the journal in-process; no journalctl fork or output pipe
+            try:
+                pattern = re.compile(grep, re.IGNORECASE) if grep else None
+            except re.error as e:
+                return f"Error: Invalid grep pattern '{grep}': {e}"
+            log_lines = await asyncio.to_thread(
+                _read_journal, unit, since_time, priority, pattern, lines
+            )
+        else:
+            log_lines, error = await asyncio.to_thread(
+                _run_journalctl, unit, since, priority, grep, lines
+            )
+            if error:
+                return error
 
-        # Check for errors
-        if result.returncode != 0:
-            error_msg = result.stderr.strip()
-            if "No journal files were found" in error_msg:
-                return "No journal logs found. This may be a permissions issue or systemd logging is not available."
-            elif "Failed to determine unit" in error_msg:
-                return f"Error: Unit '{unit}' not found. Use 'systemctl list-units' to see available units."
-            elif "Specifying boot ID" in error_msg or "Unknown time specification" in error_msg:
-                return f"Error: Invalid time specification '{since}'. Examples: '1 hour ago', 'today', '2024-01-18'"
-            else:
-                return f"Error running journalctl: {error_msg or 'Unknown error'}"
-
-        output = result.stdout.strip()
-
-        if not output:
+        if not log_lines:
             filter_info = []
             if unit:
                 filter_info.append(f"unit={unit}")
@@ -126,7 +279,6 @@ def search_systemd_logs(
         header += "=" * 50 + "\n\n"
 
         # Count log lines and provide summary
-        log_lines = output.split('\n')
         actual_count = len(log_lines)
 
         footer = f"\n\n{'=' * 50}\n"
@@ -135,12 +287,8 @@ def search_systemd_logs(
         if actual_count >= lines:
             footer += f"Note: Output limited to {lines} lines. Use a larger 'lines' parameter or narrow your search to see more.\n"
 
-        return header + output + footer
+        return header + "\n".join(log_lines) + footer
 
-    except subprocess.TimeoutExpired:
-        return "Error: journalctl command timed out (>30s). Try narrowing your search with more specific filters."
-    except FileNotFoundError:
-        return "Error: journalctl command not found. systemd logging may not be available on this system."
     except Exception as e:
-        logger.error(f"Error searching systemd logs: {e}", exc_info=True)
+        logger.error("Error searching systemd logs: %s", e, exc_info=True)
         return f"Error searching systemd logs: {str(e)}"
@@ -1,14 +1,39 @@
 """Web search tool using DuckDuckGo."""
 
 import logging
+from typing import Any
 
 from langchain_core.tools import tool
 
+from ..services.lru_cache import LRUCache
+
 logger = logging.getLogger(__name__)
 
+# Repeated queries within this many seconds are answered from memory
+SEARCH_CACHE_TTL = 600
+
+# Distinct queries kept in the cache
+SEARCH_CACHE_SIZE = 256
+
+# Normalized query -> result
+_cache: LRUCache[str, str] = LRUCache(SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+
+# Shared DuckDuckGo search tool, created on first use
+_search: Any = None
+
+
+def _get_search() -> Any:
+    """Get the shared DuckDuckGo search tool."""
+    global _search
+    if _search is None:
+        from langchain_community.tools import DuckDuckGoSearchRun
+
+        _search = DuckDuckGoSearchRun()
+    return _search
+
 
 @tool
-def search_web(query: str) -> str:
+async def search_web(query: str) -> str:
     """Search the web for current information, news, or facts.
 
     Use this tool when you need:
@@ -23,11 +48,16 @@ def search_web(query: str) -> str:
     Returns:
         Search results as formatted text
     """
-    try:
-        from langchain_community.tools import DuckDuckGoSearchRun
+    # Trivially different spellings of a query share an entry
+    key = " ".join(query.lower().split())
+    cached = _cache.get(key)
+    if cached is not None:
+        logger.info("Web search served from cache for query: %s", query)
+        return cached
 
-        search = DuckDuckGoSearchRun()
-        results = search.run(query)
+    try:
+        results = await _get_search().ainvoke(query)
+        _cache.put(key, results)
 
         logger.info("Web search completed for query: %s", query)
         return results
@@ -1,14 +1,41 @@
 """Wikipedia lookup tool."""
 
 import logging
+from typing import Any
 
 from langchain_core.tools import tool
 
+from ..services.lru_cache import LRUCache
+
 logger = logging.getLogger(__name__)
 
+# Repeated lookups within this many seconds are answered from memory
+WIKIPEDIA_CACHE_TTL = 600
+
+# Distinct lookups kept in the cache
+WIKIPEDIA_CACHE_SIZE = 256
+
+# Normalized query -> result
+_cache: LRUCache[str, str] = LRUCache(WIKIPEDIA_CACHE_SIZE, ttl=WIKIPEDIA_CACHE_TTL)
+
+# Shared Wikipedia query tool, created on first use
+_wiki: Any = None
+
+
+def _get_wiki() -> Any:
+    """Get the shared Wikipedia query tool."""
+    global _wiki
+    if _wiki is None:
+        from langchain_community.tools import WikipediaQueryRun
+        from langchain_community.utilities import WikipediaAPIWrapper
+
+        wrapper = WikipediaAPIWrapper(top_k_results=2, doc_content_chars_max=1000)
+        _wiki = WikipediaQueryRun(api_wrapper=wrapper)
+    return _wiki
+
 
 @tool
-def search_wikipedia(query: str) -> str:
+async def search_wikipedia(query: str) -> str:
     """Search Wikipedia for encyclopedic information.
 
     Use this tool for:
@@ -23,14 +50,16 @@ def search_wikipedia(query: str) -> str:
     Returns:
         Summary from Wikipedia article(s)
     """
-    try:
-        from langchain_community.tools import WikipediaQueryRun
-        from langchain_community.utilities import WikipediaAPIWrapper
-
-        wrapper = WikipediaAPIWrapper(top_k_results=2, doc_content_chars_max=1000)
-        wiki = WikipediaQueryRun(api_wrapper=wrapper)
+    # Trivially different spellings of a query share an entry
+    key = " ".join(query.lower().split())
+    cached = _cache.get(key)
+    if cached is not None:
+        logger.info("Wikipedia search served from cache for: %s", query)
+        return cached
 
-        results = wiki.run(query)
+    try:
+        results = await _get_wiki().ainvoke(query)
+        _cache.put(key, results)
         logger.info("Wikipedia search completed for: %s", query)
 
         return results
@@ -5,6 +5,7 @@ import hashlib
 import logging
 from typing import Any
 
+import orjson
 from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 
@@ -13,13 +14,34 @@ from .config import Config
 logger = logging.getLogger(__name__)
 
 
-def verify_github_signature(payload: bytes, signature: str, secret: str) -> bool:
+def verify_github_signature(payload: bytes, signature: str, secret: str | hmac.HMAC) -> bool:
     """Verify GitHub webhook signature using HMAC SHA-256.
 
     Args:
         payload: Raw request body bytes
         signature: X-Hub-Signature-256 header value (format: "sha256=...")
-        secret: Webhook secret
+        secret: Webhook secret, or a keyed SHA-256 HMAC with no data yet,
+            which is copied so the key setup isn't repeated per request
+
+    Returns:
+        True if signature is valid, False otherwise
+    """
+    # Calculate expected signature
+    if isinstance(secret, hmac.HMAC):
+        mac = secret.copy()
+        mac.update(payload)
+    else:
+        mac = hmac.new(secret.encode("utf-8"), payload, hashlib.sha256)
+
+    return check_github_signature(mac, signature)
+
+
+def check_github_signature(mac: hmac.HMAC, signature: str) -> bool:
+    """Compare a GitHub webhook signature against an HMAC fed the whole payload.
+
+    Args:
+        mac: Keyed SHA-256 HMAC that has been updated with the raw request body
+        signature: X-Hub-Signature-256 header value (format: "sha256=...")
 
     Returns:
         True if signature is valid, False otherwise
@@ -30,13 +52,7 @@ def verify_github_signature(payload: bytes, signature: str, secret: str) -> bool
 
     # Extract the signature hash
     received_signature = signature[7:]  # Remove "sha256=" prefix
-
-    # Calculate expected signature
-    expected_signature = hmac.new(
-        secret.encode("utf-8"),
-        payload,
-        hashlib.sha256
-    ).hexdigest()
+    expected_signature = mac.hexdigest()
 
     # Timing-safe comparison to prevent timing attacks
     is_valid = hmac.compare_digest(expected_signature, received_signature)
@@ -67,6 +83,12 @@ def create_webhook_app(config: Config, webhook_handler: Any) -> FastAPI:
         version="1.0.0"
     )
 
+    # Keyed once; each request verifies against a copy
+    signer = None
+    if config.github and config.github.webhook_secret:
+        secret = config.github.webhook_secret.get_secret_value().encode("utf-8")
+        signer = hmac.new(secret, digestmod=hashlib.sha256)
+
     @app.get("/health")
     async def health_check() -> dict[str, str]:
         """Health check endpoint."""
@@ -91,7 +113,6 @@ def create_webhook_app(config: Config, webhook_handler: Any) -> FastAPI:
             200 response immediately, processes event in background
         """
         # Get request data
-        body = await request.body()
         signature = request.headers.get("X-Hub-Signature-256", "")
         event_type = request.headers.get("X-GitHub-Event", "")
         delivery_id = request.headers.get("X-GitHub-Delivery", "")
@@ -103,15 +124,34 @@ def create_webhook_app(config: Config, webhook_handler: Any) -> FastAPI:
         )
 
         # Verify signature BEFORE any processing
-        if not config.github or not config.github.webhook_secret:
+        if signer is None:
             logger.error("GitHub webhook secret not configured")
             raise HTTPException(
                 status_code=500,
                 detail="Webhook secret not configured"
             )
 
-        webhook_secret = config.github.webhook_secret.get_secret_value()
-        if not verify_github_signature(body, signature, webhook_secret):
+        # Reject a missing or malformed signature before receiving the body
+        if not signature.startswith("sha256="):
+            logger.warning(
+                "Malformed webhook signature for event=%s, delivery_id=%s",
+                event_type,
+                delivery_id,
+            )
+            raise HTTPException(
+                status_code=401,
+                detail="Invalid signature"
+            )
+
+        # Hash the body as it arrives rather than after buffering all of it
+        mac = signer.copy()
+        chunks = []
+        async for chunk in request.stream():
+            mac.update(chunk)
+            chunks.append(chunk)
+        body = b"".join(chunks)
+
+        if not check_github_signature(mac, signature):
             logger.warning(
                 f"Invalid webhook signature for event={event_type}, "
                 f"delivery_id={delivery_id}"
@@ -123,9 +163,8 @@ def create_webhook_app(config: Config, webhook_handler: Any) -> FastAPI:
 
         # Parse payload (signature verified, safe to parse)
         try:
-            import json
-            payload = json.loads(body.decode("utf-8"))
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse webhook payload: {e}")
             raise HTTPException(
                 status_code=400,
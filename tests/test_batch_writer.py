@@ -0,0 +1,103 @@
+"""Tests for BatchInsertWriter."""
+
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from src.orm.rate_limit import RateLimitEvent
+from src.services.batch_writer import BatchInsertWriter
+from src.services.database import DatabaseService
+
+
+def make_row(user_did="did:plc:a"):
+    """Build a rate limit event row."""
+    return {"user_did": user_did, "event_timestamp": datetime.now(timezone.utc)}
+
+
+async def count_rows(db):
+    """Count inserted rate limit events."""
+    async with db.session() as session:
+        return await session.scalar(select(func.count()).select_from(RateLimitEvent))
+
+
+def run(tmp_path, scenario):
+    """Run an async scenario against a fresh database."""
+
+    async def main():
+        db = DatabaseService(tmp_path / "bot.db")
+        await db.initialize()
+        try:
+            await scenario(db)
+        finally:
+            await db.close()
+
+    asyncio.run(main())
+
+
+def test_flushes_when_batch_is_full(tmp_path):
+    """Test a full batch is written without waiting for the interval."""
+
+    async def scenario(db):
+        writer = BatchInsertWriter(
+            RateLimitEvent, max_batch_size=3, flush_interval=60, db_service=db
+        )
+        for _ in range(3):
+            writer.submit(make_row())
+        await asyncio.sleep(0.2)
+
+        assert await count_rows(db) == 3
+        await writer.close()
+
+    run(tmp_path, scenario)
+
+
+def test_flushes_on_interval(tmp_path):
+    """Test a partial batch is written once the flush interval passes."""
+
+    async def scenario(db):
+        writer = BatchInsertWriter(
+            RateLimitEvent, max_batch_size=100, flush_interval=0.05, db_service=db
+        )
+        writer.submit(make_row())
+        assert await count_rows(db) == 0
+
+        await asyncio.sleep(0.3)
+        assert await count_rows(db) == 1
+        await writer.close()
+
+    run(tmp_path, scenario)
+
+
+def test_flushes_on_close(tmp_path):
+    """Test close() writes queued rows without waiting out the interval."""
+
+    async def scenario(db):
+        writer = BatchInsertWriter(
+            RateLimitEvent, max_batch_size=100, flush_interval=60, db_service=db
+        )
+        writer.submit(make_row())
+        writer.submit(make_row())
+
+        await asyncio.wait_for(writer.close(), timeout=5)
+        assert await count_rows(db) == 2
+
+    run(tmp_path, scenario)
+
+
+def test_bad_row_does_not_drop_batch(tmp_path):
+    """Test a failing batch is retried row by row and only the bad row is lost."""
+
+    async def scenario(db):
+        writer = BatchInsertWriter(
+            RateLimitEvent, max_batch_size=100, flush_interval=60, db_service=db
+        )
+        writer.submit(make_row())
+        writer.submit(make_row(user_did=None))  # Violates NOT NULL
+        writer.submit(make_row())
+
+        await writer.close()
+        assert await count_rows(db) == 2
+        assert writer.dropped_rows == 1
+
+    run(tmp_path, scenario)
@@ -0,0 +1,74 @@
+"""Tests for the calculator tool."""
+
+import pytest
+
+from src.tools.calculator import calculator
+
+
+def evaluate(expression: str) -> str:
+    """Run the calculator tool on an expression."""
+    return calculator.invoke({"expression": expression})
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("2 + 3 * 4", "14"),
+        ("(2 + 3) * 4", "20"),
+        ("-7 + +2", "-5"),
+        ("10 / 4", "2.5"),
+        ("2 ** 10", "1024"),
+        ("2 ** -1", "0.5"),
+        ("sqrt(16) + 2 * 3", "10.0"),
+        ("log(e)", "1.0"),
+        ("  SQRT(9)  ", "3.0"),  # Normalized case and whitespace
+        ("2 ** 1000", str(2**1000)),  # At the exponent limit
+    ],
+)
+def test_evaluates_arithmetic(expression, expected):
+    """Test normal arithmetic is evaluated."""
+    assert evaluate(expression) == expected
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "__import__('os')",  # Unknown call target / string constant
+        "x + 1",  # Unknown name
+        "pi.real",  # Attribute access
+        "(1).__class__",  # Attribute access on a constant
+        "math.sqrt(4)",  # Call on an attribute
+        "[1, 2]",  # Unsupported syntax
+        "'a' * 3",  # Non-numeric constant
+        "True + 1",  # Booleans are not numbers here
+        "sqrt(x=4)",  # Keyword arguments
+    ],
+)
+def test_rejects_disallowed_syntax(expression):
+    """Test names, attributes, calls and other syntax outside the whitelist are rejected."""
+    assert evaluate(expression).startswith("Error: Expression not allowed")
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "9 ** 9 ** 9",  # Exponent over the limit
+        "2 ** 1001",
+        "2 ** -1001",
+        "(10 ** 999) ** 999",  # Exponent within the limit, result far too large
+        "(2 ** 1000) ** 11",
+        "(10 ** 999) * (10 ** 999) * (10 ** 999) * (10 ** 999)",  # Growth via *
+    ],
+)
+def test_rejects_oversized_results(expression):
+    """Test oversized powers and products are refused before they are computed."""
+    result = evaluate(expression)
+
+    assert result.startswith("Error evaluating expression")
+    assert "large" in result
+
+
+def test_reports_math_errors():
+    """Test runtime math errors are reported, not raised."""
+    assert evaluate("1 / 0").startswith("Error evaluating expression")
+    assert evaluate("sqrt(-1)").startswith("Error evaluating expression")
@@ -0,0 +1,57 @@
+"""Tests for CodeAnalysisService."""
+
+import asyncio
+
+import pytest
+
+from src.services.code_analysis_service import CodeAnalysisService
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Service rooted at an empty repository directory."""
+    return CodeAnalysisService(llm=None, repo_path=tmp_path)
+
+
+def apply(service, *changes):
+    """Apply changes and assert they succeeded."""
+    assert asyncio.run(service.apply_changes(list(changes))) == (True, "")
+
+
+def test_modify_then_delete_same_path(service, tmp_path):
+    """Test a later delete of a modified file wins."""
+    (tmp_path / "a.py").write_text("x = 1\n")
+
+    apply(
+        service,
+        {"file_path": "a.py", "action": "modify", "content": "x = 2\n"},
+        {"file_path": "a.py", "action": "delete"},
+    )
+
+    assert not (tmp_path / "a.py").exists()
+
+
+def test_delete_then_create_same_path(service, tmp_path):
+    """Test a file deleted and then recreated ends up with the new content."""
+    (tmp_path / "a.py").write_text("x = 1\n")
+
+    apply(
+        service,
+        {"file_path": "a.py", "action": "delete"},
+        {"file_path": "./a.py", "action": "create", "content": "x = 3\n"},
+    )
+
+    assert (tmp_path / "a.py").read_text() == "x = 3\n"
+
+
+def test_last_write_wins(service, tmp_path):
+    """Test repeated writes to one path keep the last content, other paths unaffected."""
+    apply(
+        service,
+        {"file_path": "pkg/a.py", "action": "create", "content": "x = 1\n"},
+        {"file_path": "pkg/b.py", "action": "create", "content": "y = 1\n"},
+        {"file_path": "pkg/a.py", "action": "modify", "content": "x = 2\n"},
+    )
+
+    assert (tmp_path / "pkg" / "a.py").read_text() == "x = 2\n"
+    assert (tmp_path / "pkg" / "b.py").read_text() == "y = 1\n"
@@ -0,0 +1,60 @@
+"""Tests for GitService authentication."""
+
+import asyncio
+import base64
+
+import pytest
+
+from src.services import git_service
+from src.services.git_service import GitService
+
+
+@pytest.fixture
+def spawned(monkeypatch):
+    """Record git subprocesses instead of running them."""
+    calls = []
+
+    class FakeProcess:
+        returncode = 0
+
+        async def communicate(self):
+            return b"", b""
+
+    async def fake_exec(*args, **kwargs):
+        calls.append((args, kwargs))
+        return FakeProcess()
+
+    monkeypatch.setattr(git_service.asyncio, "create_subprocess_exec", fake_exec)
+    return calls
+
+
+def test_network_commands_carry_token_outside_argv(tmp_path, spawned):
+    """Test clone, fetch and push send the token via env, never via argv."""
+
+    async def token():
+        return "ghs_secret"
+
+    async def scenario():
+        git = GitService(tmp_path / "repo", token=token)
+        assert await git.ensure_cached_clone("owner/repo") is True
+        assert await git.fetch_branch("main") is True
+        assert await git.push_branch("feature") is True
+
+    asyncio.run(scenario())
+
+    expected = base64.b64encode(b"x-access-token:ghs_secret").decode()
+    assert [args[1] for args, _ in spawned] == ["clone", "fetch", "push"]
+    for args, kwargs in spawned:
+        assert not any("ghs_secret" in arg or expected in arg for arg in args)
+        env = kwargs["env"]
+        assert env["GIT_CONFIG_KEY_0"] == "http.https://github.com/.extraHeader"
+        assert env["GIT_CONFIG_VALUE_0"] == f"Authorization: Basic {expected}"
+    # The clone runs beside the target directory, which doesn't exist yet
+    assert spawned[0][1]["cwd"] == tmp_path
+
+
+def test_no_token_inherits_environment(tmp_path, spawned):
+    """Test commands run with the inherited environment when no token is set."""
+    asyncio.run(GitService(tmp_path).fetch_branch("main"))
+
+    assert spawned[0][1]["env"] is None
@@ -0,0 +1,64 @@
+"""Tests for LRUCache."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.services import lru_cache
+from src.services.lru_cache import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the cache's time source with a manually advanced clock."""
+    fake = SimpleNamespace(now=1_000.0)
+    monkeypatch.setattr(lru_cache, "time", SimpleNamespace(monotonic=lambda: fake.now))
+    return fake
+
+
+def test_evicts_least_recently_used():
+    """Test the least recently used entry is evicted once over maxsize."""
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_cached_none_is_a_hit():
+    """Test a stored None is distinguished from a missing key."""
+    cache = LRUCache(2)
+    cache.put("a", None)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.get("b", "missing") == "missing"
+
+
+def test_entries_expire_after_ttl(clock):
+    """Test entries expire after the ttl and are dropped on lookup."""
+    cache = LRUCache(2, ttl=60)
+    cache.put("a", 1)
+
+    clock.now += 59
+    assert cache.get("a") == 1
+    clock.now += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_pop_and_clear():
+    """Test entries can be removed individually or all at once."""
+    cache = LRUCache(3)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "gone") == "gone"
+    cache.clear()
+    assert len(cache) == 0
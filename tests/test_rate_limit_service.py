@@ -0,0 +1,116 @@
+"""Tests for RateLimitService."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.services import rate_limit_service
+from src.services.database import DatabaseService
+from src.services.rate_limit_service import WINDOW_SECONDS, RateLimitService
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the service's time source with a manually advanced clock."""
+    fake = SimpleNamespace(now=1_000_000.0)
+    monkeypatch.setattr(rate_limit_service, "time", SimpleNamespace(time=lambda: fake.now))
+    return fake
+
+
+def run(tmp_path, scenario):
+    """Run an async scenario against a service backed by a fresh database."""
+
+    async def main():
+        db = DatabaseService(tmp_path / "bot.db")
+        await db.initialize()
+        service = RateLimitService(max_per_hour=2, db_service=db)
+        try:
+            await scenario(service)
+        finally:
+            await service.close()
+            await db.close()
+
+    asyncio.run(main())
+
+
+def test_try_consume_enforces_window_limit(tmp_path, clock):
+    """Test requests beyond the hourly limit are refused."""
+
+    async def scenario(service):
+        assert await service.try_consume("did:plc:a") is True
+        assert await service.try_consume("did:plc:a") is True
+        assert await service.try_consume("did:plc:a") is False
+        # Limits are per user
+        assert await service.try_consume("did:plc:b") is True
+
+    run(tmp_path, scenario)
+
+
+def test_try_consume_allows_again_after_expiry(tmp_path, clock):
+    """Test slots free up once requests leave the window."""
+
+    async def scenario(service):
+        await service.try_consume("did:plc:a")
+        clock.now += 10
+        await service.try_consume("did:plc:a")
+        assert await service.try_consume("did:plc:a") is False
+
+        # Only the first request has expired
+        clock.now += WINDOW_SECONDS - 5
+        assert await service.get_remaining("did:plc:a") == 1
+        assert await service.try_consume("did:plc:a") is True
+        assert await service.try_consume("did:plc:a") is False
+
+    run(tmp_path, scenario)
+
+
+def test_get_remaining(tmp_path, clock):
+    """Test get_remaining counts down and never goes negative."""
+
+    async def scenario(service):
+        assert await service.get_remaining("did:plc:a") == 2
+        await service.try_consume("did:plc:a")
+        assert await service.get_remaining("did:plc:a") == 1
+        await service.try_consume("did:plc:a")
+        await service.try_consume("did:plc:a")
+        assert await service.get_remaining("did:plc:a") == 0
+
+    run(tmp_path, scenario)
+
+
+def test_expired_users_are_forgotten(tmp_path, clock):
+    """Test a user's entry is dropped once their window drains."""
+
+    async def scenario(service):
+        await service.try_consume("did:plc:a")
+        await service.try_consume("did:plc:b")
+        clock.now += WINDOW_SECONDS + 1
+
+        assert await service.get_remaining("did:plc:a") == 2
+        assert "did:plc:a" not in service._windows
+
+        # Periodic cleanup prunes users that are never looked up again
+        await service.cleanup_old_events()
+        assert not service._windows
+
+    run(tmp_path, scenario)
+
+
+def test_failed_reservation_is_refunded(tmp_path, clock):
+    """Test a slot reserved for a URI is returned when the reply fails."""
+
+    async def scenario(service):
+        assert await service.try_consume("did:plc:a", mention_uri="at://m/1") is True
+        # A retry of the same item is not charged twice
+        assert await service.try_consume("did:plc:a", mention_uri="at://m/1") is True
+        assert await service.get_remaining("did:plc:a") == 1
+
+        service.settle("at://m/1", consumed=False)
+        assert await service.get_remaining("did:plc:a") == 2
+
+        await service.try_consume("did:plc:a", mention_uri="at://m/2")
+        service.settle("at://m/2", consumed=True)
+        assert await service.get_remaining("did:plc:a") == 1
+
+    run(tmp_path, scenario)
@@ -0,0 +1,78 @@
+"""Tests for WebhookHandler's bot PR cache."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.orm.selfimprovement_request import SelfImprovementRequest
+from src.services import webhook_handler
+from src.services.database import DatabaseService
+from src.services.webhook_handler import NON_BOT_PR_TTL, WebhookHandler
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the handler's time source with a manually advanced clock."""
+    fake = SimpleNamespace(now=1_000.0)
+    monkeypatch.setattr(webhook_handler, "time", SimpleNamespace(monotonic=lambda: fake.now))
+    return fake
+
+
+def run(tmp_path, scenario):
+    """Run an async scenario against a handler backed by a fresh database."""
+
+    async def main():
+        db = DatabaseService(tmp_path / "bot.db")
+        await db.initialize()
+        try:
+            await scenario(db, WebhookHandler(db, pr_improvement_service=None, owner_login="owner"))
+        finally:
+            await db.close()
+
+    asyncio.run(main())
+
+
+async def record_bot_pr(db, pr_number):
+    """Store a self-improvement request that opened the given PR."""
+    async with db.session() as session:
+        session.add(
+            SelfImprovementRequest(
+                conversation_id="c",
+                requester_did="did:plc:a",
+                prompt="p",
+                pr_number=pr_number,
+                success=True,
+            )
+        )
+
+
+def test_negative_answer_expires(tmp_path, clock):
+    """Test a non-bot answer is dropped after its TTL and re-checked."""
+
+    async def scenario(db, handler):
+        assert await handler._check_pr_and_comment(7, 1) == (False, False)
+        await record_bot_pr(db, 7)
+
+        # Still cached as non-bot within the TTL
+        clock.now += NON_BOT_PR_TTL - 1
+        assert await handler._check_pr_and_comment(7, 1) == (False, False)
+
+        clock.now += 1
+        assert await handler._check_pr_and_comment(7, 1) == (True, False)
+
+    run(tmp_path, scenario)
+
+
+def test_cache_is_bounded(tmp_path, clock, monkeypatch):
+    """Test the bot PR cache keeps at most BOT_PR_CACHE_MAX PRs."""
+    monkeypatch.setattr(webhook_handler, "BOT_PR_CACHE_MAX", 2)
+
+    async def scenario(db, handler):
+        for pr_number in range(5):
+            await handler._check_pr_and_comment(pr_number, 1)
+
+        assert len(handler._bot_pr_cache) == 2
+        assert 4 in handler._bot_pr_cache
+
+    run(tmp_path, scenario)